@@ -5,11 +5,13 @@ Load generated events data into ClickHouse.
 Usage:
     python scripts/load_to_clickhouse.py --input output/run_YYYYMMDD_HHMMSS/events.jsonl.gz --run-id baseline
     python scripts/load_to_clickhouse.py --input output/run_YYYYMMDD_HHMMSS/events.parquet --run-id exp_fast_energy
+    python scripts/load_to_clickhouse.py --input output/run_YYYYMMDD_HHMMSS/events.jsonl.zst --run-id baseline
     python scripts/load_to_clickhouse.py --delete-run baseline
 """
 
 import argparse
 import gzip
+import io
 import json
 import sys
 from pathlib import Path
@@ -28,7 +30,7 @@ def parse_args():
     parser.add_argument(
         "--input", "-i",
         default=None,
-        help="Path to events file (jsonl.gz or parquet)"
+        help="Path to events file (jsonl.gz, jsonl.zst, jsonl.lz4 or parquet)"
     )
     parser.add_argument(
         "--run-id",
@@ -84,20 +86,38 @@ def parse_args():
     return parser.parse_args()
 
 
-def read_jsonl_gz(filepath: Path, batch_size: int) -> Iterator[list[dict]]:
-    """Read JSONL.GZ file in batches."""
+def _read_jsonl_lines(f, batch_size: int) -> Iterator[list[dict]]:
+    """Read JSONL lines from an open text file in batches."""
     batch = []
-    with gzip.open(filepath, "rt", encoding="utf-8") as f:
-        for line in f:
-            event = json.loads(line)
-            batch.append(flatten_event(event))
-            if len(batch) >= batch_size:
-                yield batch
-                batch = []
+    for line in f:
+        event = json.loads(line)
+        batch.append(flatten_event(event))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
     if batch:
         yield batch
 
 
+def read_jsonl_gz(filepath: Path, batch_size: int) -> Iterator[list[dict]]:
+    """Read JSONL.GZ file in batches."""
+    with gzip.open(filepath, "rt", encoding="utf-8") as f:
+        yield from _read_jsonl_lines(f, batch_size)
+
+
+def read_jsonl_compressed(filepath: Path, codec: str, batch_size: int) -> Iterator[list[dict]]:
+    """Read zstd- or lz4-compressed JSONL file in batches."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print(f"Error: pyarrow not installed for {codec} support.")
+        print("Run: pip install pyarrow")
+        sys.exit(1)
+
+    with pa.input_stream(str(filepath), compression=codec) as raw:
+        yield from _read_jsonl_lines(io.TextIOWrapper(raw, encoding="utf-8"), batch_size)
+
+
 def read_parquet(filepath: Path, batch_size: int) -> Iterator[list[dict]]:
     """Read Parquet file in batches."""
     try:
@@ -294,12 +314,18 @@ def main():
     if filepath.suffix == ".gz" or str(filepath).endswith(".jsonl.gz"):
         reader = read_jsonl_gz(filepath, args.batch_size)
         print(f"Reading JSONL.GZ file: {filepath}")
+    elif str(filepath).endswith(".jsonl.zst"):
+        reader = read_jsonl_compressed(filepath, "zstd", args.batch_size)
+        print(f"Reading JSONL.ZST file: {filepath}")
+    elif str(filepath).endswith(".jsonl.lz4"):
+        reader = read_jsonl_compressed(filepath, "lz4", args.batch_size)
+        print(f"Reading JSONL.LZ4 file: {filepath}")
     elif filepath.suffix == ".parquet":
         reader = read_parquet(filepath, args.batch_size)
         print(f"Reading Parquet file: {filepath}")
     else:
         print(f"Error: Unsupported file format: {filepath.suffix}")
-        print("Supported formats: .jsonl.gz, .parquet")
+        print("Supported formats: .jsonl.gz, .jsonl.zst, .jsonl.lz4, .parquet")
         sys.exit(1)
 
     # Column names for insert
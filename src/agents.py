@@ -2,6 +2,7 @@
 
 import hashlib
 import math
+import sys
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from random import Random
@@ -30,6 +31,17 @@ SESSION_TIME_WEIGHTS = [
     (21, 24, 0.15),  # Late evening: 15%
 ]
 
+# Language code per country (one shared string per language)
+COUNTRY_LANGUAGES = {
+    "RU": "ru",
+    "US": "en",
+    "DE": "de",
+    "BR": "pt",
+    "JP": "ja",
+    "KR": "ko",
+    "other": "en",
+}
+
 
 def get_ab_group(user_id: str, test_name: str, variants: list, weights: list, seed: int) -> str:
     """Deterministic A/B test group assignment."""
@@ -57,6 +69,8 @@ class AgentFactory:
         self.config = config
         self.seed = seed
         self.agent_counter = 0
+        # One shared ab_tests dict per distinct assignment (never mutated in place)
+        self._ab_test_groups: dict[tuple, dict[str, str]] = {}
 
     def create_agent(
         self,
@@ -140,57 +154,33 @@ class AgentFactory:
         if platform_value < platforms.get("ios", 0.45):
             platform = Platform.IOS
             models = self.config.ios_models
-            os_version = f"{rng.randint(15, 17)}.{rng.randint(0, 5)}"
+            os_version = sys.intern(f"{rng.randint(15, 17)}.{rng.randint(0, 5)}")
         else:
             platform = Platform.ANDROID
             models = self.config.android_models
-            os_version = f"{rng.randint(11, 14)}"
+            os_version = sys.intern(f"{rng.randint(11, 14)}")
 
         device_model = rng.choice(models)
         return platform, device_model, os_version
 
     def _select_country(self, rng: Random) -> str:
         """Select country based on distribution."""
-        countries = self.config.country_distribution
-        value = rng.random()
-        cumulative = 0.0
-
-        for country, share in countries.items():
-            cumulative += share
-            if value < cumulative:
-                return country
-
-        return "other"
+        return self.config.select_country(rng.random())
 
     def _select_app_version(self, rng: Random) -> str:
         """Select app version based on weights."""
-        versions = self.config.app_versions
-        weights = self.config.app_version_weights
-
-        value = rng.random()
-        cumulative = 0.0
-        for version, weight in zip(versions, weights):
-            cumulative += weight
-            if value < cumulative:
-                return version
-
-        return versions[-1]
+        return self.config.select_app_version(rng.random())
 
     def _get_language_for_country(self, country: str) -> str:
         """Get language code for country."""
-        country_to_lang = {
-            "RU": "ru",
-            "US": "en",
-            "DE": "de",
-            "BR": "pt",
-            "JP": "ja",
-            "KR": "ko",
-            "other": "en",
-        }
-        return country_to_lang.get(country, "en")
+        return COUNTRY_LANGUAGES.get(country, "en")
 
     def _assign_ab_tests(self, user_id: str) -> dict[str, str]:
-        """Assign A/B test variants to user."""
+        """Assign A/B test variants to user.
+
+        Users with the same variants share one dict, which must not be
+        mutated; replace agent.ab_tests with a new dict to change it.
+        """
         ab_tests = {}
 
         for test_name, test_config in self.config.ab_tests.items():
@@ -211,7 +201,7 @@ class AgentFactory:
                 variant = get_ab_group(user_id, test_name, variants, weights, self.seed)
                 ab_tests[test_name] = variant
 
-        return ab_tests
+        return self._ab_test_groups.setdefault(tuple(ab_tests.items()), ab_tests)
 
 
 class AgentBehavior:
@@ -256,7 +246,7 @@ class AgentBehavior:
         modifiers = 1.0
 
         # Source modifier
-        source_mod = getattr(agent, "_source_retention_mod", 1.0)
+        source_mod = agent._source_retention_mod
         modifiers *= source_mod
 
         # A/B test modifiers
@@ -273,7 +263,7 @@ class AgentBehavior:
             modifiers *= 1.10
 
         # Bot modifier
-        if getattr(agent, "_is_bot", False):
+        if agent._is_bot:
             modifiers *= 0.3
 
         return min(base * modifiers, 0.99)
@@ -307,7 +297,7 @@ class AgentBehavior:
         if agent.is_churned:
             return False
 
-        day_since_install = (current_date - agent.install_date).days
+        day_since_install = current_date.toordinal() - agent.install_ordinal
         prob = self.get_retention_probability(agent, day_since_install)
 
         return rng.random() < prob
@@ -334,13 +324,31 @@ class AgentBehavior:
             base *= variant_effects.get("sessions_mult", 1.0)
 
         # Bot behavior
-        if getattr(agent, "_is_bot", False):
+        if agent._is_bot:
             base = rng.randint(1, 2)
 
         return max(1, round(base))
 
     def get_session_start_time(self, session_number: int, rng: Random) -> datetime:
         """Generate session start time within a day."""
+        hour, minute, second = self._draw_session_clock(rng)
+        return datetime(2000, 1, 1, hour, minute, second)
+
+    def get_session_start_times(
+        self, num_sessions: int, current_date: date, rng: Random
+    ) -> list[datetime]:
+        """Generate the day's session start times in chronological order."""
+        year, month, day = current_date.year, current_date.month, current_date.day
+        times = [
+            datetime(year, month, day, *self._draw_session_clock(rng))
+            for _ in range(num_sessions)
+        ]
+        times.sort()
+        return times
+
+    @staticmethod
+    def _draw_session_clock(rng: Random) -> tuple[int, int, int]:
+        """Draw (hour, minute, second) from the session time distribution."""
         # Select time bucket based on weights
         value = rng.random()
         cumulative = 0.0
@@ -351,10 +359,10 @@ class AgentBehavior:
                 hour = rng.randint(start_hour, end_hour - 1)
                 minute = rng.randint(0, 59)
                 second = rng.randint(0, 59)
-                return datetime(2000, 1, 1, hour, minute, second)
+                return hour, minute, second
 
         # Fallback
-        return datetime(2000, 1, 1, 12, 0, 0)
+        return 12, 0, 0
 
     def get_session_duration_minutes(
         self,
@@ -375,7 +383,7 @@ class AgentBehavior:
             base = rng.triangular(min_dur, max_dur * 0.7, min_dur * 1.3)
 
         # Bot sessions are short
-        if getattr(agent, "_is_bot", False):
+        if agent._is_bot:
             base = rng.randint(2, 5)
 
         return max(2, round(base))
@@ -531,7 +539,7 @@ class AgentBehavior:
         base_prob *= type_mults.get(agent.agent_type, 1.0)
 
         # Source monetization modifier
-        base_prob *= getattr(agent, "_source_monetization_mod", 1.0)
+        base_prob *= agent._source_monetization_mod
 
         # A/B test modifiers
         if trigger == "starter_pack_offer":
@@ -1,6 +1,8 @@
 """CLI interface for the data generator."""
 
+import os
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -11,7 +13,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskPr
 from rich.panel import Panel
 from rich.table import Table
 
-from .config import load_config, SimulationConfig
+from .config import load_config, load_config_cached, SimulationConfig
 from .validators import validate_config, ValidationError
 from .simulation import Simulator
 from .writers import OutputManager
@@ -20,36 +22,59 @@ from .writers import OutputManager
 console = Console()
 
 
-def print_banner():
-    """Print application banner."""
-    banner = """
+_BANNER = """
 ╔══════════════════════════════════════════════════════════════════╗
 ║           Idle Champions: Synthetic Data Generator               ║
 ╚══════════════════════════════════════════════════════════════════╝
     """
-    console.print(banner, style="bold blue")
+
+
+def print_banner():
+    """Print application banner."""
+    console.print(_BANNER, style="bold blue")
 
 
 def print_config_summary(config: SimulationConfig):
     """Print configuration summary."""
-    table = Table(title="Simulation Parameters", show_header=False)
-    table.add_column("Parameter", style="cyan")
-    table.add_column("Value", style="green")
-
-    table.add_row("Seed", str(config.seed))
-    table.add_row("Start Date", config.start_date)
-    table.add_row("Duration", f"{config.duration_days} days")
-    table.add_row("Total Installs", f"{config.total_installs:,}")
-    table.add_row("Output Format", config.output_format)
+    rows = [
+        ("Seed", str(config.seed)),
+        ("Start Date", config.start_date),
+        ("Duration", f"{config.duration_days} days"),
+        ("Total Installs", f"{config.total_installs:,}"),
+        ("Output Format", config.output_format),
+    ]
 
     # Bad traffic
     bad_traffic = config.bad_traffic_config
     if bad_traffic:
-        table.add_row("Bad Traffic", f"Day {bad_traffic['day']}, {bad_traffic['volume']:,} installs")
+        rows.append(("Bad Traffic", f"Day {bad_traffic['day']}, {bad_traffic['volume']:,} installs"))
+
+    # Plain lines when piped to a file or CI log
+    if not console.is_terminal:
+        console.print("Simulation Parameters", markup=False)
+        console.print("\n".join(f"  {k}: {v}" for k, v in rows), markup=False)
+        return
+
+    table = Table(title="Simulation Parameters", show_header=False)
+    table.add_column("Parameter", style="cyan")
+    table.add_column("Value", style="green")
+    for name, value in rows:
+        table.add_row(name, value)
 
     console.print(table)
 
 
+def format_size(size: int) -> str:
+    """Format a file size in bytes as a human-readable string."""
+    if size > 1024 * 1024 * 1024:
+        return f"{size / (1024**3):.2f} GB"
+    if size > 1024 * 1024:
+        return f"{size / (1024**2):.2f} MB"
+    if size > 1024:
+        return f"{size / 1024:.2f} KB"
+    return f"{size} bytes"
+
+
 def print_validation_errors(errors: list[str]):
     """Print validation errors."""
     console.print("\n[red bold]Configuration Validation Failed:[/red bold]")
@@ -103,6 +128,11 @@ def print_validation_errors(errors: list[str]):
     default=None,
     help="Output format (overrides config)",
 )
+@click.option(
+    "--config-cache",
+    is_flag=True,
+    help="Reuse a cached merge of unchanged config files (~/.cache/idle_champions/cfg)",
+)
 def main(
     config: Path,
     override: tuple[Path, ...],
@@ -112,6 +142,7 @@ def main(
     dry_run: bool,
     verbose: bool,
     format: Optional[str],
+    config_cache: bool,
 ):
     """Generate synthetic game analytics data.
 
@@ -132,7 +163,8 @@ def main(
     # Load configuration
     console.print("[CONFIG] Loading configs...", style="bold")
     try:
-        config_dict = load_config(config, list(override) if override else None)
+        loader = load_config_cached if config_cache else load_config
+        config_dict = loader(config, list(override) if override else None)
         console.print(f"  ✓ Base: {config}", style="green")
         for ov in override:
             console.print(f"  ✓ Override: {ov}", style="green")
@@ -177,7 +209,7 @@ def main(
         sys.exit(0)
 
     # Create output directory
-    run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_timestamp = time.strftime("%Y%m%d_%H%M%S")
     run_dir = output / f"run_{run_timestamp}"
     run_dir.mkdir(parents=True, exist_ok=True)
 
@@ -225,7 +257,7 @@ def main(
 
         # Finalize
         end_date = (
-            datetime.fromisoformat(sim_config.start_date)
+            sim_config.start_datetime
             + timedelta(days=sim_config.duration_days - 1)
         ).strftime("%Y-%m-%d")
 
@@ -238,18 +270,10 @@ def main(
     console.print("\n[OUTPUT] Results:", style="bold")
 
     # List output files
-    for file in run_dir.iterdir():
-        size = file.stat().st_size
-        if size > 1024 * 1024 * 1024:
-            size_str = f"{size / (1024**3):.2f} GB"
-        elif size > 1024 * 1024:
-            size_str = f"{size / (1024**2):.2f} MB"
-        elif size > 1024:
-            size_str = f"{size / 1024:.2f} KB"
-        else:
-            size_str = f"{size} bytes"
-
-        console.print(f"  ✓ {file.name} ({size_str})", style="green")
+    with os.scandir(run_dir) as entries:
+        for entry in entries:
+            size_str = format_size(entry.stat().st_size)
+            console.print(f"  ✓ {entry.name} ({size_str})", style="green")
 
     console.print(f"\n[DONE] Completed in {elapsed}", style="bold green")
     console.print(f"  Total events: {total_events:,}")
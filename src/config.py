@@ -1,16 +1,26 @@
 """Configuration loading and merging for the simulator."""
 
-import copy
+import hashlib
+import marshal
+import os
+from bisect import bisect_right
+from datetime import date, datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 
+import numpy as np
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml(path: Path) -> dict:
     """Load a YAML configuration file."""
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    with open(path, "rb") as f:
+        data = f.read()
+    return yaml.load(data, Loader=_YAML_LOADER) or {}
 
 
 def deep_merge(base: dict, override: dict) -> dict:
@@ -18,18 +28,24 @@ def deep_merge(base: dict, override: dict) -> dict:
 
     Arrays are replaced, not merged.
     Nested dicts are merged recursively.
+
+    Neither input is modified. Only the dicts along merged paths are copied;
+    untouched base sections and override values are shared with the result,
+    so callers must not mutate override dicts after merging.
     """
-    result = copy.deepcopy(base)
-
-    for key, value in override.items():
-        if (
-            key in result
-            and isinstance(result[key], dict)
-            and isinstance(value, dict)
-        ):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = copy.deepcopy(value)
+    result = dict(base)
+    stack = [(result, override)]
+
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = dict(current)
+                target[key] = merged
+                stack.append((merged, value))
+            else:
+                target[key] = value
 
     return result
 
@@ -57,206 +73,347 @@ def load_config(
     return config
 
 
+# Part of the config cache key; bump whenever load_yaml or deep_merge change
+# what a given set of files merges to, so older cache entries are not served
+CONFIG_CACHE_VERSION = 1
+
+
+def default_config_cache_dir() -> Path:
+    """Directory for cached merged configs (honours XDG_CACHE_HOME)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "idle_champions" / "cfg"
+
+
+def load_config_cached(
+    base_path: Path,
+    override_paths: Optional[list[Path]] = None,
+    cache_dir: Optional[Path] = None,
+) -> dict:
+    """Like load_config, but reuse a cached merge of identical input files.
+
+    The cache key is a blake2b digest of CONFIG_CACHE_VERSION, the marshal
+    format version and the raw bytes of the base and each override, in
+    order. Entries are stored with marshal rather than JSON so YAML int keys
+    (e.g. VIP levels) survive the round trip. On a miss the config is built
+    by load_config; cache I/O errors fall back to a normal load.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(CONFIG_CACHE_VERSION.to_bytes(4, "little"))
+    digest.update(marshal.version.to_bytes(4, "little"))
+    for path in [base_path, *(override_paths or [])]:
+        with open(path, "rb") as f:
+            blob = f.read()
+        digest.update(len(blob).to_bytes(8, "little"))
+        digest.update(blob)
+
+    cache_path = (cache_dir or default_config_cache_dir()) / f"{digest.hexdigest()}.bin"
+    try:
+        with open(cache_path, "rb") as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    config = load_config(base_path, override_paths)
+
+    try:
+        data = marshal.dumps(config)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        pass
+
+    return config
+
+
+def flatten_config(config: dict, prefix: str = "") -> dict[str, Any]:
+    """Flatten nested config sections into dotted keys.
+
+    Only non-dict values become entries, e.g. ``{"economy.energy.max": 120}``.
+    Lists are kept as-is.
+    """
+    flat: dict[str, Any] = {}
+    for key, value in config.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_config(value, f"{path}."))
+        else:
+            flat[path] = value
+    return flat
+
+
+class _CumulativeTable:
+    """Names with running share totals, for weighted picks from uniform draws.
+
+    Totals are summed in order, matching a linear ``cumulative += w`` scan, so
+    a pick agrees with that scan for the same draw. Draws past the last total
+    map to ``default``.
+    """
+
+    __slots__ = ("names", "cumulative", "default", "_lookup", "_cdf")
+
+    def __init__(self, names: list, weights: list, default: Any):
+        picked = []
+        cumulative = []
+        total = 0.0
+        for name, weight in zip(names, weights):
+            total += weight
+            picked.append(name)
+            cumulative.append(total)
+        self.names = tuple(picked)
+        self.cumulative = cumulative
+        self.default = default
+        self._lookup = np.array(picked + [default], dtype=object)
+        self._cdf = np.array(cumulative, dtype=np.float64)
+
+    def pick(self, value: float) -> Any:
+        idx = bisect_right(self.cumulative, value)
+        return self.names[idx] if idx < len(self.names) else self.default
+
+    def pick_many(self, values: np.ndarray) -> np.ndarray:
+        idx = np.searchsorted(self._cdf, np.asarray(values, dtype=np.float64), side="right")
+        return self._lookup[idx]
+
+
 class SimulationConfig:
-    """Wrapper for simulation configuration with typed access."""
+    """Wrapper for simulation configuration with typed access.
 
-    def __init__(self, config: dict):
+    Scalar settings are read from a dotted-key view built once at construction
+    and each accessor is cached on first use, so the config dict should not be
+    mutated after it is wrapped.
+    """
+
+    def __init__(self, config: dict, flat: Optional[dict[str, Any]] = None):
         self._config = config
+        self._flat = flat if flat is not None else flatten_config(config)
 
     @property
     def raw(self) -> dict:
         """Get raw configuration dictionary."""
         return self._config
 
-    # Simulation parameters
     @property
+    def flat(self) -> dict[str, Any]:
+        """Get configuration as a flat dotted-key dictionary."""
+        return self._flat
+
+    # Simulation parameters
+    @cached_property
     def seed(self) -> int:
-        return self._config["simulation"]["seed"]
+        return self._flat["simulation.seed"]
 
-    @property
+    @cached_property
     def start_date(self) -> str:
-        return self._config["simulation"]["start_date"]
+        return self._flat["simulation.start_date"]
 
-    @property
+    @cached_property
+    def start_datetime(self) -> datetime:
+        """Simulation start date parsed once, as midnight datetime."""
+        return datetime.fromisoformat(self.start_date)
+
+    @cached_property
+    def start_day(self) -> date:
+        """Simulation start date parsed once."""
+        return self.start_datetime.date()
+
+    @cached_property
     def duration_days(self) -> int:
-        return self._config["simulation"]["duration_days"]
+        return self._flat["simulation.duration_days"]
 
     # Install parameters
-    @property
+    @cached_property
     def total_installs(self) -> int:
-        return self._config["installs"]["total"]
+        return self._flat["installs.total"]
 
-    @property
+    @cached_property
     def install_distribution(self) -> str:
-        return self._config["installs"]["distribution"]
+        return self._flat["installs.distribution"]
 
-    @property
+    @cached_property
     def install_decay_rate(self) -> float:
-        return self._config["installs"].get("decay_rate", 0.02)
+        return self._flat.get("installs.decay_rate", 0.02)
 
-    @property
+    @cached_property
     def install_sources(self) -> dict:
         return self._config["installs"]["sources"]
 
     # Player types
-    @property
+    @cached_property
     def player_types(self) -> dict:
         return self._config["player_types"]
 
     # Economy
-    @property
+    @cached_property
     def economy(self) -> dict:
         return self._config["economy"]
 
-    @property
+    @cached_property
     def initial_gold(self) -> int:
-        return self._config["economy"]["initial"]["gold"]
+        return self._flat["economy.initial.gold"]
 
-    @property
+    @cached_property
     def initial_gems(self) -> int:
-        return self._config["economy"]["initial"]["gems"]
+        return self._flat["economy.initial.gems"]
 
-    @property
+    @cached_property
     def initial_summon_tickets(self) -> int:
-        return self._config["economy"]["initial"]["summon_tickets"]
+        return self._flat["economy.initial.summon_tickets"]
 
-    @property
+    @cached_property
     def initial_energy(self) -> int:
-        return self._config["economy"]["initial"]["energy"]
+        return self._flat["economy.initial.energy"]
 
-    @property
+    @cached_property
     def max_energy(self) -> int:
-        return self._config["economy"]["energy"]["max"]
+        return self._flat["economy.energy.max"]
 
-    @property
+    @cached_property
     def energy_regen_minutes(self) -> int:
-        return self._config["economy"]["energy"]["regen_minutes"]
+        return self._flat["economy.energy.regen_minutes"]
 
-    @property
+    @cached_property
     def stage_energy_cost(self) -> int:
-        return self._config["economy"]["energy"]["stage_cost"]
+        return self._flat["economy.energy.stage_cost"]
 
     # Gacha
-    @property
+    @cached_property
     def gacha(self) -> dict:
         return self._config["gacha"]
 
-    @property
+    @cached_property
     def gacha_single_cost(self) -> int:
-        return self._config["gacha"]["single_gems"]
+        return self._flat["gacha.single_gems"]
 
-    @property
+    @cached_property
     def gacha_multi_cost(self) -> int:
-        return self._config["gacha"]["multi_gems"]
+        return self._flat["gacha.multi_gems"]
 
-    @property
+    @cached_property
     def gacha_rates(self) -> dict:
         return self._config["gacha"]["rates"]
 
-    @property
+    @cached_property
     def pity_threshold(self) -> int:
-        return self._config["gacha"]["pity"]["threshold"]
+        return self._flat["gacha.pity.threshold"]
 
-    @property
+    @cached_property
     def soft_pity_start(self) -> int:
-        return self._config["gacha"]["pity"]["soft_pity_start"]
+        return self._flat["gacha.pity.soft_pity_start"]
 
-    @property
+    @cached_property
     def soft_pity_rate_boost(self) -> float:
-        return self._config["gacha"]["pity"]["soft_pity_rate_boost"]
+        return self._flat["gacha.pity.soft_pity_rate_boost"]
 
     # Shop
-    @property
+    @cached_property
     def shop_products(self) -> dict:
         return self._config["shop"]["products"]
 
-    @property
+    @cached_property
     def ad_reward_gems(self) -> int:
-        return self._config["shop"]["ads"]["reward_gems"]
+        return self._flat["shop.ads.reward_gems"]
 
-    @property
+    @cached_property
     def max_ads_per_day(self) -> int:
-        return self._config["shop"]["ads"]["max_per_day"]
+        return self._flat["shop.ads.max_per_day"]
 
-    @property
+    @cached_property
     def ad_cooldown_minutes(self) -> int:
-        return self._config["shop"]["ads"]["cooldown_minutes"]
+        return self._flat["shop.ads.cooldown_minutes"]
 
     # VIP
-    @property
+    @cached_property
     def vip_levels(self) -> dict:
         return self._config["vip"]["levels"]
 
     # Progression
-    @property
+    @cached_property
     def progression(self) -> dict:
         return self._config["progression"]
 
-    @property
+    @cached_property
     def total_chapters(self) -> int:
-        return self._config["progression"]["chapters"]
+        return self._flat["progression.chapters"]
 
-    @property
+    @cached_property
     def stages_per_chapter(self) -> int:
-        return self._config["progression"]["stages_per_chapter"]
+        return self._flat["progression.stages_per_chapter"]
 
-    @property
+    @cached_property
     def feature_unlocks(self) -> dict:
         return self._config["progression"]["unlocks"]
 
+    @cached_property
+    def unlocks_by_level(self) -> dict:
+        """Feature names keyed by the player level that unlocks them."""
+        by_level: dict = {}
+        for feature, level in self.feature_unlocks.items():
+            by_level.setdefault(level, []).append(feature)
+        return by_level
+
     # Heroes
-    @property
+    @cached_property
     def heroes(self) -> dict:
         return self._config["heroes"]
 
-    @property
+    @cached_property
     def hero_pool(self) -> dict:
         return self._config["heroes"]["pool"]
 
-    @property
+    @cached_property
     def hero_base_power(self) -> dict:
         return self._config["heroes"]["base_power"]
 
     # Social
-    @property
+    @cached_property
     def social(self) -> dict:
         return self._config["social"]
 
-    @property
+    @cached_property
     def arena_daily_attempts(self) -> int:
-        return self._config["social"]["arena"]["daily_attempts"]
+        return self._flat["social.arena.daily_attempts"]
 
-    @property
+    @cached_property
     def arena_attempt_cost_gems(self) -> int:
-        return self._config["social"]["arena"]["attempt_cost_gems"]
+        return self._flat["social.arena.attempt_cost_gems"]
 
-    @property
+    @cached_property
     def arena_rating_start(self) -> int:
-        return self._config["social"]["arena"]["rating_start"]
+        return self._flat["social.arena.rating_start"]
 
-    @property
+    @cached_property
     def arena_rating_k_factor(self) -> int:
-        return self._config["social"]["arena"]["rating_k_factor"]
+        return self._flat["social.arena.rating_k_factor"]
 
-    @property
+    @cached_property
     def guild_count(self) -> int:
-        return self._config["social"]["guilds"]["count"]
+        return self._flat["social.guilds.count"]
 
-    @property
+    @cached_property
     def guild_max_members(self) -> int:
-        return self._config["social"]["guilds"]["max_members"]
+        return self._flat["social.guilds.max_members"]
 
     # A/B Tests
-    @property
+    @cached_property
     def ab_tests(self) -> dict:
         return self._config.get("ab_tests", {})
 
+    @cached_property
+    def ad_reward_gems_by_variant(self) -> dict:
+        return self.get_ab_effect_values("ad_reward_amount", "reward_gems")
+
+    @cached_property
+    def starter_pack_price_by_variant(self) -> dict:
+        return self.get_ab_effect_values("starter_pack_price", "price_usd")
+
     # Scenarios
-    @property
+    @cached_property
     def scenarios(self) -> dict:
         return self._config.get("scenarios", {})
 
-    @property
+    @cached_property
     def bad_traffic_config(self) -> Optional[dict]:
         scenarios = self.scenarios
         if scenarios.get("bad_traffic", {}).get("enabled", False):
@@ -264,55 +421,67 @@ class SimulationConfig:
         return None
 
     # Output
-    @property
+    @cached_property
     def output_format(self) -> str:
-        return self._config["output"]["format"]
+        return self._flat["output.format"]
 
-    @property
+    @cached_property
     def output_compression(self) -> str:
-        return self._config["output"]["compression"]
+        return self._flat["output.compression"]
 
-    @property
+    @cached_property
     def output_batch_size(self) -> int:
-        return self._config["output"]["batch_size"]
+        return self._flat["output.batch_size"]
 
-    @property
+    @cached_property
     def include_metadata(self) -> bool:
-        return self._config["output"]["include_metadata"]
+        return self._flat["output.include_metadata"]
 
     # Devices
-    @property
+    @cached_property
     def devices(self) -> dict:
         return self._config["devices"]
 
-    @property
+    @cached_property
     def platform_distribution(self) -> dict:
         return self._config["devices"]["platforms"]
 
-    @property
+    @cached_property
     def country_distribution(self) -> dict:
         return self._config["devices"]["countries"]
 
-    @property
+    @cached_property
     def ios_models(self) -> list:
-        return self._config["devices"]["ios_models"]
+        return self._flat["devices.ios_models"]
 
-    @property
+    @cached_property
     def android_models(self) -> list:
-        return self._config["devices"]["android_models"]
+        return self._flat["devices.android_models"]
 
-    @property
+    @cached_property
     def app_versions(self) -> list:
-        return self._config["devices"]["app_versions"]
+        return self._flat["devices.app_versions"]
 
-    @property
+    @cached_property
     def app_version_weights(self) -> list:
-        return self._config["devices"]["app_version_weights"]
+        return self._flat["devices.app_version_weights"]
 
     def get_ab_test_config(self, test_name: str) -> Optional[dict]:
         """Get configuration for a specific A/B test."""
         return self.ab_tests.get(test_name)
 
+    def get_ab_effect_values(self, test_name: str, key: str) -> dict:
+        """Map each variant of an A/B test to its value for one effect key.
+
+        Variants whose effects do not set the key are left out.
+        """
+        effects = self.ab_tests.get(test_name, {}).get("effects", {})
+        return {
+            variant: effect[key]
+            for variant, effect in effects.items()
+            if key in effect
+        }
+
     def is_ab_test_enabled(self, test_name: str) -> bool:
         """Check if an A/B test is enabled."""
         test_config = self.get_ab_test_config(test_name)
@@ -320,20 +489,99 @@ class SimulationConfig:
             return test_config.get("enabled", False)
         return False
 
+    @cached_property
+    def _vip_table(self) -> tuple[np.ndarray, np.ndarray]:
+        """VIP thresholds sorted ascending, aligned with the level they grant."""
+        items = sorted(
+            (data["threshold"], int(level))
+            for level, data in self.vip_levels.items()
+        )
+        thresholds = np.array([t for t, _ in items], dtype=np.float64)
+        # Running max keeps the "highest level whose threshold is met" rule
+        # even if a higher level is configured with a lower threshold.
+        levels = np.maximum.accumulate(
+            np.array([lvl for _, lvl in items], dtype=np.int32)
+        )
+        return thresholds, levels
+
+    @cached_property
+    def _vip_scalar_table(self) -> tuple[list[float], list[int]]:
+        """_vip_table as plain lists, for single lookups via bisect."""
+        thresholds, levels = self._vip_table
+        return thresholds.tolist(), [max(lvl, 0) for lvl in levels.tolist()]
+
     def get_vip_level_for_spend(self, total_spent: float) -> int:
         """Get VIP level for a given total spend amount."""
-        current_level = 0
-        for level, data in self.vip_levels.items():
-            level_int = int(level)
-            threshold = data["threshold"]
-            if total_spent >= threshold and level_int > current_level:
-                current_level = level_int
-        return current_level
-
-    def get_vip_bonuses(self, vip_level: int) -> dict:
-        """Get bonuses for a VIP level."""
-        level_data = self.vip_levels.get(str(vip_level), {})
+        thresholds, levels = self._vip_scalar_table
+        idx = bisect_right(thresholds, total_spent) - 1
+        if idx < 0:
+            return 0
+        return levels[idx]
+
+    def get_vip_levels_for_spends(self, total_spent: np.ndarray) -> np.ndarray:
+        """Vectorized get_vip_level_for_spend over an array of spend amounts."""
+        thresholds, levels = self._vip_table
+        spends = np.asarray(total_spent, dtype=np.float64)
+        if levels.size == 0:
+            return np.zeros(spends.shape, dtype=np.int32)
+        idx = np.searchsorted(thresholds, spends, side="right") - 1
+        result = levels[np.maximum(idx, 0)]
+        return np.where(idx >= 0, np.maximum(result, 0), 0).astype(np.int32)
+
+    @cached_property
+    def _vip_bonus_table(self) -> dict[int, tuple[int, float]]:
+        """(energy_bonus, gold_bonus) per VIP level, keyed by int level."""
         return {
-            "energy_bonus": level_data.get("energy_bonus", 0),
-            "gold_bonus": level_data.get("gold_bonus", 0),
+            int(level): (data.get("energy_bonus", 0), data.get("gold_bonus", 0))
+            for level, data in self.vip_levels.items()
         }
+
+    def get_vip_bonuses(self, vip_level: int) -> tuple[int, float]:
+        """Get (energy_bonus, gold_bonus) for a VIP level."""
+        return self._vip_bonus_table.get(vip_level, (0, 0))
+
+    @cached_property
+    def _install_source_table(self) -> _CumulativeTable:
+        sources = self.install_sources
+        names = list(sources.keys())
+        return _CumulativeTable(
+            names, [cfg["share"] for cfg in sources.values()], names[-1]
+        )
+
+    @cached_property
+    def _country_table(self) -> _CumulativeTable:
+        countries = self.country_distribution
+        return _CumulativeTable(list(countries.keys()), list(countries.values()), "other")
+
+    @cached_property
+    def _app_version_table(self) -> _CumulativeTable:
+        versions = self.app_versions
+        return _CumulativeTable(versions, self.app_version_weights, versions[-1])
+
+    def select_install_source(self, value: float) -> str:
+        """Map a uniform draw in [0, 1) to an install source by share."""
+        return self._install_source_table.pick(value)
+
+    def select_install_sources(self, values: np.ndarray) -> np.ndarray:
+        """Vectorized select_install_source over an array of uniform draws."""
+        return self._install_source_table.pick_many(values)
+
+    def select_country(self, value: float) -> str:
+        """Map a uniform draw in [0, 1) to a country by share."""
+        return self._country_table.pick(value)
+
+    def select_countries(self, values: np.ndarray) -> np.ndarray:
+        """Vectorized select_country over an array of uniform draws."""
+        return self._country_table.pick_many(values)
+
+    def select_app_version(self, value: float) -> str:
+        """Map a uniform draw in [0, 1) to an app version by weight."""
+        return self._app_version_table.pick(value)
+
+    def select_app_versions(self, values: np.ndarray) -> np.ndarray:
+        """Vectorized select_app_version over an array of uniform draws."""
+        return self._app_version_table.pick_many(values)
+
+    def sample_app_versions(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Draw n app versions by weight using a numpy Generator."""
+        return self._app_version_table.pick_many(rng.random(n))
@@ -1,8 +1,9 @@
 """Event generation for all 36 event types."""
 
+import sys
 from datetime import datetime, date
 from random import Random
-from typing import Optional
+from typing import Callable, Optional
 
 from .models import (
     Event,
@@ -12,21 +13,75 @@ from .models import (
     GachaBanner,
     Guild,
     GameEvent,
+    format_iso_date,
+    format_stage_id,
     generate_event_id,
     generate_transaction_id,
 )
 
 
+# Upper bound on recycled Event objects kept between flushes
+POOL_SIZE = 4096
+
+# Events buffered before an emitter with a sink flushes on its own
+FLUSH_THRESHOLD = 50_000
+
+
 class EventEmitter:
-    """Generates events for all game actions."""
+    """Generates events for all game actions.
+
+    With a ``sink`` the buffer is handed over whenever it reaches
+    ``flush_threshold`` events, so it stays bounded between explicit flushes.
+    """
+
+    __slots__ = ("events", "_pool", "_sink", "_flush_threshold")
 
-    def __init__(self):
+    def __init__(
+        self,
+        sink: Optional[Callable[[list[Event]], None]] = None,
+        flush_threshold: int = FLUSH_THRESHOLD,
+    ):
         self.events: list[Event] = []
+        self._pool: list[Event] = []
+        self._sink = sink
+        # Without a sink there is nothing to flush to; never trigger
+        self._flush_threshold = flush_threshold if sink is not None else sys.maxsize
+
+    def flush(self) -> None:
+        """Hand accumulated events to the sink and recycle them.
+
+        Call only where the caller holds no returned events (the simulator
+        flushes once per agent-day).
+        """
+        if self.events and self._sink is not None:
+            self._sink(self.events)
+            self.release_all()
+
+    def _hand_off(self) -> None:
+        """Hand accumulated events to the sink without recycling them.
+
+        Used by the automatic flush, which runs inside an emit while the
+        caller may still hold earlier returned events.
+        """
+        self._sink(self.events)
+        self.events = []
 
     def clear(self) -> None:
         """Clear accumulated events."""
         self.events = []
 
+    def release_all(self) -> None:
+        """Clear accumulated events and recycle them for later emits.
+
+        Only call once nothing holds a reference to the returned events,
+        e.g. after the writers have serialized them. The automatic
+        threshold flush never recycles (see _hand_off).
+        """
+        free = POOL_SIZE - len(self._pool)
+        if free > 0:
+            self._pool.extend(self.events[:free])
+        self.events = []
+
     def get_events(self) -> list[Event]:
         """Get all accumulated events."""
         return self.events
@@ -38,22 +93,94 @@ class EventEmitter:
         agent: AgentState,
         current_date: date,
         event_properties: dict,
+        _Event=Event,
+        _event_id=generate_event_id,
     ) -> Event:
         """Create a base event with common fields."""
-        event = Event(
-            event_id=generate_event_id(),
-            event_name=event_name,
-            event_timestamp=timestamp,
-            user_id=agent.user_id,
-            session_id=agent.current_session_id or "",
-            device=agent.get_device_info(),
-            user_properties=agent.get_user_properties(current_date),
-            ab_tests=agent.ab_tests.copy(),
-            event_properties=event_properties,
-        )
-        self.events.append(event)
+        # Hot path: globals are bound as defaults and attributes read once.
+        pool = self._pool
+        events = self.events
+        if pool:
+            event = pool.pop()
+            event.event_id = _event_id()
+            event.event_name = event_name
+            event.event_timestamp = timestamp
+            event.user_id = agent.user_id
+            event.session_id = agent.current_session_id
+            event.device = agent.get_device_info()
+            event.user_properties = agent.get_user_properties(current_date)
+            event.ab_tests = agent.ab_tests
+            event.event_properties = event_properties
+        else:
+            # Positional in Event field order; keyword calls into the
+            # dataclass __init__ are several times slower on this hot path.
+            event = _Event(
+                _event_id(),
+                event_name,
+                timestamp,
+                agent.user_id,
+                agent.current_session_id,
+                agent.get_device_info(),
+                agent.get_user_properties(current_date),
+                agent.ab_tests,
+                event_properties,
+            )
+        events.append(event)
+        if len(events) >= self._flush_threshold:
+            self._hand_off()
         return event
 
+    def _create_events(
+        self,
+        event_name: str,
+        agent: AgentState,
+        current_date: date,
+        items: list[tuple[datetime, dict]],
+    ) -> list[Event]:
+        """Create same-named events for one agent from (timestamp, properties).
+
+        Agent-level fields are read once and shared by every event, so the
+        agent must not change in between (e.g. the pulls of one summon).
+        """
+        user_id = agent.user_id
+        session_id = agent.current_session_id
+        device = agent.get_device_info()
+        user_properties = agent.get_user_properties(current_date)
+        ab_tests = agent.ab_tests
+        pool = self._pool
+
+        created = []
+        for timestamp, event_properties in items:
+            if pool:
+                event = pool.pop()
+                event.event_id = generate_event_id()
+                event.event_name = event_name
+                event.event_timestamp = timestamp
+                event.user_id = user_id
+                event.session_id = session_id
+                event.device = device
+                event.user_properties = user_properties
+                event.ab_tests = ab_tests
+                event.event_properties = event_properties
+            else:
+                event = Event(
+                    generate_event_id(),
+                    event_name,
+                    timestamp,
+                    user_id,
+                    session_id,
+                    device,
+                    user_properties,
+                    ab_tests,
+                    event_properties,
+                )
+            created.append(event)
+
+        self.events.extend(created)
+        if len(self.events) >= self._flush_threshold:
+            self._hand_off()
+        return created
+
     # =========================================================================
     # SESSION EVENTS
     # =========================================================================
@@ -172,7 +299,7 @@ class EventEmitter:
         hero_ids: list[str],
     ) -> Event:
         """Emit stage_start event."""
-        stage_id = f"ch{chapter:02d}_st{stage:02d}"
+        stage_id = format_stage_id(chapter, stage)
         return self._create_event(
             "stage_start",
             timestamp,
@@ -204,7 +331,7 @@ class EventEmitter:
         loot_items: list[dict],
     ) -> Event:
         """Emit stage_complete event."""
-        stage_id = f"ch{chapter:02d}_st{stage:02d}"
+        stage_id = format_stage_id(chapter, stage)
         return self._create_event(
             "stage_complete",
             timestamp,
@@ -236,7 +363,7 @@ class EventEmitter:
         required_power: int,
     ) -> Event:
         """Emit stage_fail event."""
-        stage_id = f"ch{chapter:02d}_st{stage:02d}"
+        stage_id = format_stage_id(chapter, stage)
         return self._create_event(
             "stage_fail",
             timestamp,
@@ -363,8 +490,8 @@ class EventEmitter:
                 "summon_cost_amount": summon_cost_amount,
                 "hero_id": hero.hero_id,
                 "hero_name": hero.name,
-                "hero_rarity": hero.rarity.value,
-                "hero_class": hero.hero_class.value,
+                "hero_rarity": hero.rarity,
+                "hero_class": hero.hero_class,
                 "is_new": is_new,
                 "is_duplicate": is_duplicate,
                 "is_featured": hero.hero_id == banner.featured_hero_id,
@@ -374,6 +501,48 @@ class EventEmitter:
             },
         )
 
+    def emit_gacha_summon_batch(
+        self,
+        agent: AgentState,
+        current_date: date,
+        banner: GachaBanner,
+        summon_type: str,
+        summon_cost_currency: str,
+        summon_cost_amount: int,
+        pulls: list[tuple[datetime, HeroTemplate, bool, int, int, bool]],
+    ) -> list[Event]:
+        """Emit gacha_summon events for every pull of one summon.
+
+        Each pull is (timestamp, hero, is_new, pity_counter_before,
+        pity_counter_after, pity_triggered). The cost is reported on the
+        first pull only, as with emit_gacha_summon.
+        """
+        banner_id = banner.banner_id
+        banner_type = banner.banner_type
+        featured_hero_id = banner.featured_hero_id
+
+        items = []
+        for i, (timestamp, hero, is_new, pity_before, pity_after, pity_triggered) in enumerate(pulls):
+            items.append((timestamp, {
+                "banner_id": banner_id,
+                "banner_type": banner_type,
+                "summon_type": summon_type,
+                "summon_index": i + 1,
+                "summon_cost_currency": summon_cost_currency,
+                "summon_cost_amount": summon_cost_amount if i == 0 else 0,
+                "hero_id": hero.hero_id,
+                "hero_name": hero.name,
+                "hero_rarity": hero.rarity,
+                "hero_class": hero.hero_class,
+                "is_new": is_new,
+                "is_duplicate": not is_new,
+                "is_featured": hero.hero_id == featured_hero_id,
+                "pity_counter_before": pity_before,
+                "pity_counter_after": pity_after,
+                "pity_triggered": pity_triggered,
+            }))
+        return self._create_events("gacha_summon", agent, current_date, items)
+
     # =========================================================================
     # HERO EVENTS
     # =========================================================================
@@ -399,7 +568,7 @@ class EventEmitter:
             {
                 "hero_id": hero.hero_id,
                 "hero_name": hero.template.name,
-                "hero_rarity": hero.template.rarity.value,
+                "hero_rarity": hero.template.rarity,
                 "old_level": old_level,
                 "new_level": new_level,
                 "gold_spent": gold_spent,
@@ -429,7 +598,7 @@ class EventEmitter:
             {
                 "hero_id": hero.hero_id,
                 "hero_name": hero.template.name,
-                "hero_rarity": hero.template.rarity.value,
+                "hero_rarity": hero.template.rarity,
                 "old_stars": old_stars,
                 "new_stars": new_stars,
                 "duplicates_used": duplicates_used,
@@ -873,8 +1042,8 @@ class EventEmitter:
                 "event_id": game_event.event_id,
                 "event_type": game_event.event_type,
                 "event_name": game_event.event_name,
-                "event_start_date": game_event.start_date.isoformat(),
-                "event_end_date": game_event.end_date.isoformat(),
+                "event_start_date": format_iso_date(game_event.start_date),
+                "event_end_date": format_iso_date(game_event.end_date),
                 "days_remaining": game_event.days_remaining(current_date),
             },
         )
@@ -944,25 +1113,28 @@ class EventEmitter:
         current_date: date,
     ) -> Event:
         """Emit player_state_snapshot event (daily snapshot)."""
-        max_stage_id = f"ch{agent.max_chapter:02d}_st{agent.max_stage:02d}"
+        max_stage_id = format_stage_id(agent.max_chapter, agent.max_stage)
+        # Same (cached) object _create_event attaches; reuse its rounded spend
+        user_properties = agent.get_user_properties(current_date)
+        snapshot_date = format_iso_date(current_date)
         return self._create_event(
             "player_state_snapshot",
             timestamp,
             agent,
             current_date,
             {
-                "snapshot_date": current_date.isoformat(),
+                "snapshot_date": snapshot_date,
                 "player_level": agent.player_level,
                 "vip_level": agent.vip_level,
-                "total_spent_usd": round(agent.total_spent_usd, 2),
+                "total_spent_usd": user_properties.total_spent_usd,
                 "gold_balance": agent.gold,
                 "gems_balance": agent.gems,
                 "energy_balance": agent.energy,
                 "summon_tickets_balance": agent.summon_tickets,
                 "heroes_count": len(agent.heroes),
-                "heroes_by_rarity": agent.get_heroes_by_rarity(),
-                "max_hero_level": agent.get_max_hero_level(),
-                "max_hero_stars": agent.get_max_hero_stars(),
+                "heroes_by_rarity": dict(agent.hero_rarity_counts),
+                "max_hero_level": agent.max_hero_level,
+                "max_hero_stars": agent.max_hero_stars,
                 "team_power": agent.team_power,
                 "max_chapter": agent.max_chapter,
                 "max_stage": agent.max_stage,
@@ -974,7 +1146,7 @@ class EventEmitter:
                 "total_playtime_sec": agent.total_playtime_sec,
                 "total_gacha_pulls": agent.total_gacha_pulls,
                 "pity_counter": agent.pity_counter,
-                "last_active_date": current_date.isoformat(),
+                "last_active_date": snapshot_date,
             },
         )
 
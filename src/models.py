@@ -1,11 +1,22 @@
 """Data models for the game simulator."""
 
+import itertools
+import json
+import os
 from dataclasses import dataclass, field
 from datetime import datetime, date
 from typing import Optional
 from enum import Enum
 import uuid
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+# Naive timestamps are UTC; render them with a trailing "Z" like to_dict()
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z if orjson else 0
+
 
 class PlayerType(str, Enum):
     """Player archetype types."""
@@ -40,9 +51,9 @@ class Platform(str, Enum):
     ANDROID = "android"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HeroTemplate:
-    """Template for a hero type (static data)."""
+    """Template for a hero type (static data, shared by all instances)."""
     hero_id: str
     name: str
     rarity: HeroRarity
@@ -50,7 +61,13 @@ class HeroTemplate:
     base_power: int
 
 
-@dataclass
+# Hero power grows by this factor per star; the bonus is tabulated for the
+# star counts a hero can reach
+_STAR_MULTIPLIER = 1.2
+_STAR_BONUS = tuple(_STAR_MULTIPLIER ** i for i in range(10))
+
+
+@dataclass(slots=True)
 class HeroInstance:
     """Instance of a hero owned by a player."""
     hero_id: str
@@ -58,19 +75,33 @@ class HeroInstance:
     level: int = 1
     stars: int = 1
     duplicates: int = 0
+    # Power cache, recomputed when (level, stars) differs from the cached key
+    _power_key: Optional[tuple[int, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _power: int = field(default=0, init=False, repr=False, compare=False)
 
     @property
     def power(self) -> int:
         """Calculate current power of the hero."""
+        key = (self.level, self.stars)
+        if key == self._power_key:
+            return self._power
         power_per_level = 10
-        star_multiplier = 1.2
         base = self.template.base_power
         level_bonus = (self.level - 1) * power_per_level
-        star_bonus = star_multiplier ** (self.stars - 1)
-        return int((base + level_bonus) * star_bonus)
+        star_steps = self.stars - 1
+        if 0 <= star_steps < len(_STAR_BONUS):
+            star_bonus = _STAR_BONUS[star_steps]
+        else:
+            star_bonus = _STAR_MULTIPLIER ** star_steps
+        power = int((base + level_bonus) * star_bonus)
+        self._power_key = key
+        self._power = power
+        return power
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     """Device information for events."""
     device_id: str
@@ -82,7 +113,7 @@ class DeviceInfo:
     language: str
 
 
-@dataclass
+@dataclass(slots=True)
 class UserProperties:
     """User properties included in every event."""
     player_level: int
@@ -93,7 +124,7 @@ class UserProperties:
     current_chapter: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Base event structure."""
     event_id: str
@@ -106,6 +137,19 @@ class Event:
     ab_tests: dict[str, str]
     event_properties: dict
 
+    def to_json(self) -> str:
+        """Serialize the event as a single JSON line (same content as to_dict)."""
+        if orjson is not None:
+            return orjson.dumps(self, option=_ORJSON_OPTIONS).decode()
+        # Compact separators, so lines are byte-identical to orjson's
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize the event as a single UTF-8 encoded JSON line."""
+        if orjson is not None:
+            return orjson.dumps(self, option=_ORJSON_OPTIONS)
+        return self.to_json().encode("utf-8")
+
     def to_dict(self) -> dict:
         """Convert event to dictionary for serialization."""
         return {
@@ -116,7 +160,7 @@ class Event:
             "session_id": self.session_id,
             "device": {
                 "device_id": self.device.device_id,
-                "platform": self.device.platform.value,
+                "platform": self.device.platform,  # str enum, encodes as its value
                 "os_version": self.device.os_version,
                 "app_version": self.device.app_version,
                 "device_model": self.device.device_model,
@@ -136,7 +180,7 @@ class Event:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyQuestProgress:
     """Progress on a daily quest."""
     quest_id: str
@@ -147,7 +191,7 @@ class DailyQuestProgress:
     reward_claimed: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """Complete state of a player agent."""
 
@@ -165,6 +209,8 @@ class AgentState:
     os_version: str
     app_version: str
     language: str = "en"
+    # install_date.toordinal(), for day arithmetic without timedelta objects
+    install_ordinal: int = field(default=0, init=False, repr=False, compare=False)
 
     # A/B tests
     ab_tests: dict[str, str] = field(default_factory=dict)
@@ -202,6 +248,12 @@ class AgentState:
     heroes: dict[str, HeroInstance] = field(default_factory=dict)
     team: list[str] = field(default_factory=list)  # hero_ids
     team_power: int = 0
+    # Collection aggregates, kept up to date by add_hero/level_up_hero
+    hero_rarity_counts: dict[str, int] = field(
+        default_factory=lambda: {"common": 0, "rare": 0, "epic": 0, "legendary": 0}
+    )
+    max_hero_level: int = 0
+    max_hero_stars: int = 0
 
     # Gacha
     pity_counter: int = 0
@@ -221,6 +273,10 @@ class AgentState:
     claimed_daily_login: bool = False
     claimed_idle_today: bool = False
     daily_quests: list[DailyQuestProgress] = field(default_factory=list)
+    # quest_id -> quest over daily_quests, kept in sync by set_daily_quests
+    daily_quests_by_id: dict[str, DailyQuestProgress] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     # Engagement tracking
     total_sessions: int = 0
@@ -236,36 +292,84 @@ class AgentState:
     churn_date: Optional[date] = None
 
     # Session tracking
-    current_session_id: Optional[str] = None
+    current_session_id: str = ""  # "" outside a session
     current_session_start: Optional[datetime] = None
     current_session_events: int = 0
     session_stages_played: int = 0
     session_gems_spent: int = 0
     session_gold_spent: int = 0
 
+    # Install-source modifiers (set by AgentFactory / bad-traffic scenario)
+    _source_retention_mod: float = field(
+        default=1.0, init=False, repr=False, compare=False
+    )
+    _source_monetization_mod: float = field(
+        default=1.0, init=False, repr=False, compare=False
+    )
+    _is_bot: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
+
+    # Per-event caches (DeviceInfo never changes; UserProperties is rebuilt
+    # only when one of its inputs does)
+    _device_info: Optional[DeviceInfo] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _user_props_key: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _user_props: Optional[UserProperties] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        """Derive cached install fields."""
+        self.install_ordinal = self.install_date.toordinal()
+
     def get_device_info(self) -> DeviceInfo:
         """Get device info for events."""
-        return DeviceInfo(
-            device_id=self.device_id,
-            platform=self.platform,
-            os_version=self.os_version,
-            app_version=self.app_version,
-            device_model=self.device_model,
-            country=self.country,
-            language=self.language,
-        )
+        device = self._device_info
+        if device is None:
+            device = DeviceInfo(
+                device_id=self.device_id,
+                platform=self.platform,
+                os_version=self.os_version,
+                app_version=self.app_version,
+                device_model=self.device_model,
+                country=self.country,
+                language=self.language,
+            )
+            self._device_info = device
+        return device
 
     def get_user_properties(self, current_date: date) -> UserProperties:
-        """Get user properties for events."""
-        days_since = (current_date - self.install_date).days
-        return UserProperties(
+        """Get user properties for events.
+
+        The returned object is shared between calls with the same inputs and
+        must not be mutated.
+        """
+        key = (
+            current_date,
+            self.player_level,
+            self.vip_level,
+            self.total_spent_usd,
+            self.current_chapter,
+        )
+        if key == self._user_props_key:
+            return self._user_props
+
+        days_since = current_date.toordinal() - self.install_ordinal
+        props = UserProperties(
             player_level=self.player_level,
             vip_level=self.vip_level,
             total_spent_usd=round(self.total_spent_usd, 2),
             days_since_install=days_since,
-            cohort_date=self.install_date.isoformat(),
+            cohort_date=format_iso_date(self.install_date),
             current_chapter=self.current_chapter,
         )
+        self._user_props_key = key
+        self._user_props = props
+        return props
 
     def reset_daily_state(self) -> None:
         """Reset daily counters."""
@@ -275,11 +379,29 @@ class AgentState:
         self.attacked_guild_boss_today = False
         self.claimed_daily_login = False
         self.claimed_idle_today = False
-        self.daily_quests = []
+        self.daily_quests.clear()
+        self.daily_quests_by_id.clear()
         self.got_legendary_recently = False
 
+    def set_daily_quests(self, quests: list[DailyQuestProgress]) -> None:
+        """Replace today's daily quests."""
+        self.daily_quests = quests
+        self.daily_quests_by_id = {quest.quest_id: quest for quest in quests}
+
+    def progress_daily_quest(self, quest_id: str, amount: int = 1) -> None:
+        """Advance an uncompleted daily quest, completing it at its target."""
+        quest = self.daily_quests_by_id.get(quest_id)
+        if quest is not None and not quest.completed:
+            quest.current += amount
+            if quest.current >= quest.target:
+                quest.completed = True
+
     def calculate_team_power(self) -> int:
-        """Calculate total power of the team."""
+        """Recalculate total power of the team from scratch.
+
+        add_hero and level_up_hero keep team_power up to date incrementally;
+        this is only needed after changing heroes or the team directly.
+        """
         total = 0
         for hero_id in self.team:
             if hero_id in self.heroes:
@@ -289,10 +411,11 @@ class AgentState:
 
     def add_hero(self, template: HeroTemplate) -> tuple[HeroInstance, bool]:
         """Add a hero to the collection. Returns (instance, is_new)."""
-        if template.hero_id in self.heroes:
+        existing = self.heroes.get(template.hero_id)
+        if existing is not None:
             # Duplicate - add to existing
-            self.heroes[template.hero_id].duplicates += 1
-            return self.heroes[template.hero_id], False
+            existing.duplicates += 1
+            return existing, False
         else:
             # New hero
             instance = HeroInstance(
@@ -303,35 +426,44 @@ class AgentState:
                 duplicates=0,
             )
             self.heroes[template.hero_id] = instance
+            self.hero_rarity_counts[template.rarity] += 1
+            if instance.level > self.max_hero_level:
+                self.max_hero_level = instance.level
+            if instance.stars > self.max_hero_stars:
+                self.max_hero_stars = instance.stars
 
             # Add to team if space
             if len(self.team) < 5:
                 self.team.append(template.hero_id)
-                self.calculate_team_power()
+                self.team_power += instance.power
 
             return instance, True
 
+    def level_up_hero(self, hero: HeroInstance) -> None:
+        """Raise a hero's level by one, keeping team_power in step."""
+        in_team = hero.hero_id in self.team
+        if in_team:
+            self.team_power -= hero.power
+        hero.level += 1
+        if in_team:
+            self.team_power += hero.power
+        if hero.level > self.max_hero_level:
+            self.max_hero_level = hero.level
+
     def get_heroes_by_rarity(self) -> dict[str, int]:
         """Get count of heroes by rarity."""
-        counts = {"common": 0, "rare": 0, "epic": 0, "legendary": 0}
-        for hero in self.heroes.values():
-            counts[hero.template.rarity.value] += 1
-        return counts
+        return dict(self.hero_rarity_counts)
 
     def get_max_hero_level(self) -> int:
         """Get the maximum level among all heroes."""
-        if not self.heroes:
-            return 0
-        return max(h.level for h in self.heroes.values())
+        return self.max_hero_level
 
     def get_max_hero_stars(self) -> int:
         """Get the maximum stars among all heroes."""
-        if not self.heroes:
-            return 0
-        return max(h.stars for h in self.heroes.values())
+        return self.max_hero_stars
 
 
-@dataclass
+@dataclass(slots=True)
 class Guild:
     """Guild data structure."""
     guild_id: str
@@ -346,7 +478,7 @@ class Guild:
         return self.member_count >= self.max_members
 
 
-@dataclass
+@dataclass(slots=True)
 class GachaBanner:
     """Gacha banner data."""
     banner_id: str
@@ -364,7 +496,7 @@ class GachaBanner:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class GameEvent:
     """Temporary game event (login event, summon event, etc.)."""
     event_id: str
@@ -373,6 +505,11 @@ class GameEvent:
     start_date: date
     end_date: date
     milestones: list[dict] = field(default_factory=list)
+    _end_ordinal: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Derive cached date fields."""
+        self._end_ordinal = self.end_date.toordinal()
 
     def is_active(self, current_date: date) -> bool:
         """Check if event is active on given date."""
@@ -380,12 +517,47 @@ class GameEvent:
 
     def days_remaining(self, current_date: date) -> int:
         """Get days remaining for the event."""
-        return (self.end_date - current_date).days
+        return self._end_ordinal - current_date.toordinal()
+
+
+# Stage ids are formatted constantly; chapters/stages are small, so keep a table
+_STAGE_ID_MAX_CHAPTER = 40
+_STAGE_ID_MAX_STAGE = 30
+_STAGE_IDS = tuple(
+    tuple(f"ch{chapter:02d}_st{stage:02d}" for stage in range(_STAGE_ID_MAX_STAGE + 1))
+    for chapter in range(_STAGE_ID_MAX_CHAPTER + 1)
+)
+
+
+def format_stage_id(chapter: int, stage: int) -> str:
+    """Format a stage ID like ``ch01_st05``."""
+    try:
+        return _STAGE_IDS[chapter][stage]
+    except IndexError:
+        return f"ch{chapter:02d}_st{stage:02d}"
+
+
+# Simulated dates repeat across many events; format each one once
+_ISO_DATES: dict[date, str] = {}
+
+
+def format_iso_date(value: date) -> str:
+    """Format a date as YYYY-MM-DD, reusing the string for repeated dates."""
+    text = _ISO_DATES.get(value)
+    if text is None:
+        text = _ISO_DATES[value] = value.isoformat()
+    return text
+
+
+# Event IDs keep the UUID layout: a random v4 UUID per process with the last
+# 48 bits replaced by a counter, so no urandom call is needed per event.
+_EVENT_ID_PREFIX = str(uuid.uuid4())[:24]
+_event_id_counter = itertools.count()
 
 
 def generate_event_id() -> str:
     """Generate a unique event ID."""
-    return f"evt_{uuid.uuid4()}"
+    return f"evt_{_EVENT_ID_PREFIX}{next(_event_id_counter) & 0xFFFFFFFFFFFF:012x}"
 
 
 def generate_user_id(index: int) -> str:
@@ -398,9 +570,22 @@ def generate_device_id(index: int) -> str:
     return f"d_{index:06d}"
 
 
+def _random_hex_chunks(nbytes: int, batch: int = 4096):
+    """Yield random hex strings of nbytes each, drawing urandom in batches."""
+    width = nbytes * 2
+    while True:
+        block = os.urandom(nbytes * batch).hex()
+        for start in range(0, len(block), width):
+            yield block[start:start + width]
+
+
+# 48 random bits per session ID, as uuid4().hex[:12] gave
+_session_hex = _random_hex_chunks(6)
+
+
 def generate_session_id() -> str:
     """Generate a session ID."""
-    return f"s_{uuid.uuid4().hex[:12]}"
+    return f"s_{next(_session_hex)}"
 
 
 def generate_transaction_id(timestamp: datetime) -> str:
@@ -10,12 +10,14 @@ from .config import SimulationConfig
 from .models import (
     AgentState,
     HeroRarity,
+    HeroTemplate,
     PlayerType,
+    format_stage_id,
     generate_session_id,
 )
 from .agents import AgentFactory, AgentBehavior, get_ab_group
 from .events import EventEmitter
-from .world import WorldState
+from .world import MAX_HERO_LEVEL, MAX_PLAYER_LEVEL, WorldState
 from .writers import OutputManager
 
 
@@ -38,7 +40,34 @@ EXTENDED_TUTORIAL_STEPS = [
     {"id": "tut_advanced_tips", "name": "Advanced Tips", "duration_range": (10, 25)},
 ]
 
+# (id, name, min_duration, max_duration) per step for each onboarding variant
+_TUTORIAL_PLANS = {
+    variant: tuple(
+        (step["id"], step["name"], *step["duration_range"]) for step in steps
+    )
+    for variant, steps in (
+        ("short", TUTORIAL_STEPS[:4]),
+        ("extended", TUTORIAL_STEPS + EXTENDED_TUTORIAL_STEPS),
+        ("control", TUTORIAL_STEPS),
+    )
+}
+
+# Shared timedelta objects for the whole-second steps between events (every
+# step in this module is drawn from a small literal range well under an hour)
+_SECONDS = tuple(timedelta(seconds=i) for i in range(3601))
+
+# Permanent churn probability by days since install: up to a week, a month,
+# two months, then beyond (index capped at _PERMANENT_CHURN_MAX_DAYS)
+_PERMANENT_CHURN_MAX_DAYS = 61
+_PERMANENT_CHURN_BY_DAYS = tuple(
+    0.1 if days <= 7 else 0.3 if days <= 30 else 0.5 if days <= 60 else 0.7
+    for days in range(_PERMANENT_CHURN_MAX_DAYS + 1)
+)
+
 AD_NETWORKS = ["unity_ads", "applovin", "ironsource", "admob"]
+AD_PLACEMENTS = ["main_screen", "shop", "energy_refill"]
+IAP_FAIL_REASONS = ["cancelled", "payment_error", "network_error"]
+SHOP_TABS = ["iap", "gems", "daily", "special"]
 
 PRODUCT_NAMES = {
     "starter_pack": "Starter Pack",
@@ -55,10 +84,20 @@ PRODUCT_NAMES = {
 class SimulationState:
     """State tracking for simulation."""
     agents: list[AgentState] = field(default_factory=list)
-    active_agents: set[str] = field(default_factory=set)  # user_ids
-    churned_agents: set[str] = field(default_factory=set)
+    # Agents not yet churned, in install order (the daily loop's working set)
+    active_agents: list[AgentState] = field(default_factory=list)
     installs_per_day: list[int] = field(default_factory=list)
 
+    @property
+    def churned_count(self) -> int:
+        """Number of permanently churned agents."""
+        return len(self.agents) - len(self.active_agents)
+
+    @property
+    def active_count(self) -> int:
+        """Number of agents that have not churned."""
+        return len(self.active_agents)
+
 
 class Simulator:
     """Main simulation engine."""
@@ -80,9 +119,14 @@ class Simulator:
         self.state = SimulationState()
         self.agent_factory: Optional[AgentFactory] = None
         self.behavior: Optional[AgentBehavior] = None
-        self.emitter = EventEmitter()
+        self._starting_heroes: tuple[HeroTemplate, ...] = ()
+        # Writers serialize events immediately, so flushed events can be recycled
+        self.emitter = EventEmitter(sink=output_manager.write_events)
 
         self.current_date: Optional[date] = None
+        # current_date.toordinal() and the previous day, for day arithmetic
+        self.current_ordinal = 0
+        self.previous_date: Optional[date] = None
         self.day_number = 0
 
     def run(self) -> None:
@@ -94,12 +138,14 @@ class Simulator:
         self._calculate_install_distribution()
 
         # Main simulation loop
-        start_date = date.fromisoformat(self.config.start_date)
+        start_date = self.config.start_day
         duration = self.config.duration_days
 
         for day in range(duration):
             self.day_number = day + 1
+            self.previous_date = start_date + timedelta(days=day - 1)
             self.current_date = start_date + timedelta(days=day)
+            self.current_ordinal = self.current_date.toordinal()
             self.world.current_date = self.current_date
             self.world.day_number = self.day_number
 
@@ -120,6 +166,8 @@ class Simulator:
         self.agent_factory = AgentFactory(self.config, self.seed)
         self.behavior = AgentBehavior(self.config)
         self.output.set_config(self.config)
+        # Hero templates are fixed once the world exists
+        self._starting_heroes = tuple(self.world.get_heroes_by_rarity(HeroRarity.COMMON))
 
     def _calculate_install_distribution(self) -> None:
         """Calculate how many installs per day."""
@@ -168,23 +216,23 @@ class Simulator:
         # 1. Create new installs
         self._create_daily_installs()
 
-        # 2. Simulate existing agents
-        for agent in self.state.agents:
-            if agent.is_churned:
-                continue
-
+        # 2. Simulate existing agents (churned agents are dropped from the list)
+        still_active = []
+        churn_by_days = _PERMANENT_CHURN_BY_DAYS
+        for agent in self.state.active_agents:
             if self.behavior.will_return_today(agent, self.current_date, self.rng):
                 self._simulate_agent_day(agent)
             else:
                 # Check for permanent churn
-                days_since = (self.current_date - agent.install_date).days
-                churn_prob = self._get_permanent_churn_probability(agent, days_since)
+                days_since = self.current_ordinal - agent.install_ordinal
+                # Inlined _get_permanent_churn_probability
+                churn_prob = churn_by_days[min(days_since, _PERMANENT_CHURN_MAX_DAYS)]
                 if self.rng.random() < churn_prob:
                     agent.is_churned = True
                     agent.churn_date = self.current_date
-                    self.state.churned_agents.add(agent.user_id)
-                    if agent.user_id in self.state.active_agents:
-                        self.state.active_agents.remove(agent.user_id)
+                    continue
+            still_active.append(agent)
+        self.state.active_agents = still_active
 
     def _create_daily_installs(self) -> None:
         """Create new player installs for the day."""
@@ -214,7 +262,7 @@ class Simulator:
                 rng=self.rng,
             )
             self.state.agents.append(agent)
-            self.state.active_agents.add(agent.user_id)
+            self.state.active_agents.append(agent)
             self.output.record_install(source, agent.agent_type.value)
 
             # First session (install day)
@@ -224,6 +272,8 @@ class Simulator:
         if bad_installs > 0:
             source_name = bad_traffic.get("source_name", "fake_network")
             bot_ratio = bad_traffic.get("bot_ratio", 0.4)
+            retention_mod = bad_traffic.get("retention_modifier", 0.3)
+            monetization_mod = bad_traffic.get("monetization_modifier", 0.1)
 
             for _ in range(bad_installs):
                 is_bot = self.rng.random() < bot_ratio
@@ -234,11 +284,11 @@ class Simulator:
                     is_bot=is_bot,
                 )
                 # Apply bad traffic modifiers
-                agent._source_retention_mod = bad_traffic.get("retention_modifier", 0.3)
-                agent._source_monetization_mod = bad_traffic.get("monetization_modifier", 0.1)
+                agent._source_retention_mod = retention_mod
+                agent._source_monetization_mod = monetization_mod
 
                 self.state.agents.append(agent)
-                self.state.active_agents.add(agent.user_id)
+                self.state.active_agents.append(agent)
                 self.output.record_install(source_name, agent.agent_type.value)
 
                 # Bot first session
@@ -246,34 +296,17 @@ class Simulator:
 
     def _select_install_source(self) -> str:
         """Select traffic source for a new install."""
-        sources = self.config.install_sources
-        value = self.rng.random()
-        cumulative = 0.0
-
-        for source, config in sources.items():
-            cumulative += config["share"]
-            if value < cumulative:
-                return source
-
-        return list(sources.keys())[-1]
+        return self.config.select_install_source(self.rng.random())
 
     def _get_permanent_churn_probability(self, agent: AgentState, days_since: int) -> float:
         """Get probability of permanent churn after not returning."""
         # Higher chance of permanent churn for longer absences
-        if days_since <= 7:
-            return 0.1
-        elif days_since <= 30:
-            return 0.3
-        elif days_since <= 60:
-            return 0.5
-        else:
-            return 0.7
+        return _PERMANENT_CHURN_BY_DAYS[min(days_since, _PERMANENT_CHURN_MAX_DAYS)]
 
     def _simulate_first_session(self, agent: AgentState) -> None:
         """Simulate the first session (install + tutorial)."""
         # Session start
-        session_time = self.behavior.get_session_start_time(1, self.rng)
-        timestamp = datetime.combine(self.current_date, session_time.time())
+        timestamp = self.behavior.get_session_start_times(1, self.current_date, self.rng)[0]
 
         agent.current_session_id = generate_session_id()
         agent.current_session_start = timestamp
@@ -323,7 +356,7 @@ class Simulator:
         agent.total_playtime_sec = duration_min * 60
         agent.last_session_date = self.current_date
         agent.last_session_end = end_timestamp
-        agent.current_session_id = None
+        agent.current_session_id = ""
 
         # Write events
         self._flush_events()
@@ -333,19 +366,14 @@ class Simulator:
         # Determine tutorial steps based on A/B test
         variant = agent.ab_tests.get("onboarding_length", "control")
 
-        if variant == "short":
-            steps = TUTORIAL_STEPS[:4]
-        elif variant == "extended":
-            steps = TUTORIAL_STEPS + EXTENDED_TUTORIAL_STEPS
-        else:
-            steps = TUTORIAL_STEPS
+        steps = _TUTORIAL_PLANS.get(variant, _TUTORIAL_PLANS["control"])
 
         current_time = start_time
         total_duration = 0
         steps_completed = 0
         steps_skipped = 0
 
-        for i, step in enumerate(steps):
+        for i, (step_id, step_name, min_dur, max_dur) in enumerate(steps):
             # Chance to skip (after first 2)
             is_skipped = i >= 2 and self.rng.random() < 0.1
 
@@ -353,7 +381,6 @@ class Simulator:
                 duration = self.rng.randint(1, 3)
                 steps_skipped += 1
             else:
-                min_dur, max_dur = step["duration_range"]
                 duration = self.rng.randint(min_dur, max_dur)
                 steps_completed += 1
 
@@ -361,15 +388,15 @@ class Simulator:
                 agent=agent,
                 timestamp=current_time,
                 current_date=self.current_date,
-                step_id=step["id"],
+                step_id=step_id,
                 step_number=i + 1,
-                step_name=step["name"],
+                step_name=step_name,
                 duration_sec=duration,
                 is_skipped=is_skipped,
             )
             agent.current_session_events += 1
 
-            current_time += timedelta(seconds=duration)
+            current_time += _SECONDS[duration]
             total_duration += duration
             agent.tutorial_step = i + 1
 
@@ -388,23 +415,21 @@ class Simulator:
     def _give_starting_heroes(self, agent: AgentState, timestamp: datetime) -> None:
         """Give starting heroes to new player."""
         # 3 common heroes to start
-        common_heroes = self.world.get_heroes_by_rarity(HeroRarity.COMMON)
+        common_heroes = self._starting_heroes
         for _ in range(3):
             hero_template = self.rng.choice(common_heroes)
             agent.add_hero(hero_template)
 
-        agent.calculate_team_power()
-
     def _simulate_agent_day(self, agent: AgentState) -> None:
         """Simulate one day for an existing agent."""
         # Reset daily state
         agent.reset_daily_state()
 
         # Generate daily quests
-        agent.daily_quests = self.behavior.generate_daily_quests(agent, self.rng)
+        agent.set_daily_quests(self.behavior.generate_daily_quests(agent, self.rng))
 
         # Check for late game A/B test activation
-        days_since = (self.current_date - agent.install_date).days
+        days_since = self.current_ordinal - agent.install_ordinal
         if days_since >= 30 and "late_game_offer" not in agent.ab_tests:
             test_config = self.config.ab_tests.get("late_game_offer", {})
             if test_config.get("enabled", False):
@@ -414,11 +439,12 @@ class Simulator:
                     variant = get_ab_group(
                         agent.user_id, "late_game_offer", variants, weights, self.seed
                     )
-                    agent.ab_tests["late_game_offer"] = variant
+                    # Copy-on-write: already emitted events share the old dict
+                    agent.ab_tests = {**agent.ab_tests, "late_game_offer": variant}
 
         # Update login streak
         if agent.last_session_date:
-            if (self.current_date - agent.last_session_date).days == 1:
+            if agent.last_session_date == self.previous_date:
                 agent.login_streak += 1
             else:
                 agent.login_streak = 1
@@ -428,14 +454,10 @@ class Simulator:
         # Determine number of sessions
         num_sessions = self.behavior.get_sessions_count(agent, self.current_date, self.rng)
 
-        # Generate session times
-        session_times = []
-        for i in range(num_sessions):
-            time = self.behavior.get_session_start_time(i + 1, self.rng)
-            session_times.append(datetime.combine(self.current_date, time.time()))
-
-        # Sort by time
-        session_times.sort()
+        # Generate session times (sorted)
+        session_times = self.behavior.get_session_start_times(
+            num_sessions, self.current_date, self.rng
+        )
 
         # Simulate each session
         for i, session_start in enumerate(session_times):
@@ -448,6 +470,7 @@ class Simulator:
                 timestamp=session_times[0],
                 current_date=self.current_date,
             )
+            # One flush per agent-day; sessions leave their events buffered
             self._flush_events()
 
     def _simulate_session(
@@ -496,59 +519,62 @@ class Simulator:
             current_time = self._claim_daily_login(agent, current_time)
             current_time = self._claim_monthly_pass(agent, current_time)
 
-        # Main gameplay loop
-        remaining_time = (end_time - current_time).total_seconds() / 60
+        # Main gameplay loop (hot: bind lookups to locals)
+        rng = self.rng
+        rng_random = rng.random
+        behavior = self.behavior
+        stage_energy_cost = self.config.stage_energy_cost
+        # Keep acting while more than a minute remains
+        last_action_start = end_time - _SECONDS[60]
 
-        while remaining_time > 1:
-            action_time = self.rng.randint(10, 60)  # seconds per action
+        while current_time < last_action_start:
+            action_time = rng.randint(10, 60)  # seconds per action
 
             # Try different actions
             action_taken = False
 
             # Campaign stages
-            if agent.energy >= self.config.stage_energy_cost and self.rng.random() < 0.85:
+            if agent.energy >= stage_energy_cost and rng_random() < 0.85:
                 current_time = self._play_stage(agent, current_time)
                 action_taken = True
 
             # Hero upgrades
-            elif self.rng.random() < 0.70:
+            elif rng_random() < 0.70:
                 current_time = self._upgrade_hero(agent, current_time)
                 action_taken = True
 
             # Gacha
-            elif self.behavior.should_do_gacha(agent, self.rng):
+            elif behavior.should_do_gacha(agent, rng):
                 current_time = self._do_gacha(agent, current_time)
                 action_taken = True
 
             # Arena
-            elif self.behavior.should_do_arena(agent, self.rng):
+            elif behavior.should_do_arena(agent, rng):
                 current_time = self._do_arena(agent, current_time)
                 action_taken = True
 
             # Guild boss
-            elif self.behavior.should_attack_guild_boss(agent, self.rng):
+            elif behavior.should_attack_guild_boss(agent, rng):
                 current_time = self._attack_guild_boss(agent, current_time)
                 action_taken = True
 
             # Guild join
-            elif self.behavior.should_join_guild(agent, self.rng):
+            elif behavior.should_join_guild(agent, rng):
                 current_time = self._join_guild(agent, current_time)
                 action_taken = True
 
             # Watch ads
-            elif self.behavior.should_watch_ad(agent, self.rng):
+            elif behavior.should_watch_ad(agent, rng):
                 current_time = self._watch_ad(agent, current_time)
                 action_taken = True
 
             # Shop browse / IAP
-            elif self.rng.random() < 0.30:
+            elif rng_random() < 0.30:
                 current_time = self._browse_shop(agent, current_time)
                 action_taken = True
 
             if not action_taken:
-                current_time += timedelta(seconds=action_time)
-
-            remaining_time = (end_time - current_time).total_seconds() / 60
+                current_time += _SECONDS[action_time]
 
             # Safety check
             if current_time >= end_time:
@@ -572,10 +598,7 @@ class Simulator:
         agent.total_playtime_sec += actual_duration
         agent.last_session_date = self.current_date
         agent.last_session_end = current_time
-        agent.current_session_id = None
-
-        # Flush events
-        self._flush_events()
+        agent.current_session_id = ""
 
     def _claim_idle_rewards(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Claim idle rewards."""
@@ -595,7 +618,7 @@ class Simulator:
             agent.gold += rewards["gold"]
             agent.player_exp += rewards["exp"]
 
-            max_stage_id = f"ch{agent.max_chapter:02d}_st{agent.max_stage:02d}"
+            max_stage_id = format_stage_id(agent.max_chapter, agent.max_stage)
 
             self.emitter.emit_idle_reward_claim(
                 agent=agent,
@@ -623,7 +646,7 @@ class Simulator:
             self._check_level_up(agent, timestamp)
 
         agent.claimed_idle_today = True
-        return timestamp + timedelta(seconds=self.rng.randint(5, 15))
+        return timestamp + _SECONDS[self.rng.randint(5, 15)]
 
     def _claim_daily_login(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Claim daily login reward."""
@@ -671,7 +694,7 @@ class Simulator:
         agent.current_session_events += 1
 
         agent.claimed_daily_login = True
-        return timestamp + timedelta(seconds=self.rng.randint(3, 10))
+        return timestamp + _SECONDS[self.rng.randint(3, 10)]
 
     def _claim_monthly_pass(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Claim monthly pass daily reward."""
@@ -680,7 +703,7 @@ class Simulator:
 
         # Check if pass is still active
         if agent.monthly_pass_start:
-            days_active = (self.current_date - agent.monthly_pass_start).days
+            days_active = self.current_ordinal - agent.monthly_pass_start.toordinal()
             if days_active >= 30:
                 agent.has_active_monthly = False
                 return timestamp
@@ -701,7 +724,7 @@ class Simulator:
             )
             agent.current_session_events += 1
 
-        return timestamp + timedelta(seconds=self.rng.randint(2, 5))
+        return timestamp + _SECONDS[self.rng.randint(2, 5)]
 
     def _play_stage(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Play a campaign stage."""
@@ -725,7 +748,7 @@ class Simulator:
             amount=energy_cost,
             balance_after=agent.energy,
             sink="stage_entry",
-            sink_id=f"ch{chapter:02d}_st{stage:02d}",
+            sink_id=format_stage_id(chapter, stage),
         )
         agent.current_session_events += 1
 
@@ -750,7 +773,7 @@ class Simulator:
         success, stars = self.behavior.simulate_stage_result(agent, required_power, self.rng)
         duration = self.rng.randint(30, 120)  # seconds
 
-        end_time = timestamp + timedelta(seconds=duration)
+        end_time = timestamp + _SECONDS[duration]
 
         if success:
             is_first = (chapter > agent.max_chapter) or (chapter == agent.max_chapter and stage > agent.max_stage)
@@ -788,7 +811,7 @@ class Simulator:
                 amount=rewards["gold"],
                 balance_after=agent.gold,
                 source="stage_reward",
-                source_id=f"ch{chapter:02d}_st{stage:02d}",
+                source_id=format_stage_id(chapter, stage),
             )
             agent.current_session_events += 1
 
@@ -834,11 +857,15 @@ class Simulator:
         best_hero = None
         best_cost = float("inf")
 
+        # Cheapest affordable level-up
+        levelup_costs = self.world.levelup_costs
+        gold = agent.gold
         for hero in agent.heroes.values():
-            if hero.level >= 100:
+            level = hero.level
+            if level >= MAX_HERO_LEVEL:
                 continue
-            cost = self.world.get_levelup_cost(hero.level)
-            if cost <= agent.gold and cost < best_cost:
+            cost = levelup_costs[level]
+            if cost <= gold and cost < best_cost:
                 best_hero = hero
                 best_cost = cost
 
@@ -850,7 +877,7 @@ class Simulator:
         old_power = best_hero.power
         agent.gold -= best_cost
         agent.session_gold_spent += best_cost
-        best_hero.level += 1
+        agent.level_up_hero(best_hero)
 
         self.emitter.emit_economy_sink(
             agent=agent,
@@ -877,17 +904,10 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        # Update team power
-        agent.calculate_team_power()
-
         # Update daily quest
-        for quest in agent.daily_quests:
-            if quest.quest_id == "dq_levelup" and not quest.completed:
-                quest.current += 1
-                if quest.current >= quest.target:
-                    quest.completed = True
+        agent.progress_daily_quest("dq_levelup")
 
-        return timestamp + timedelta(seconds=self.rng.randint(5, 15))
+        return timestamp + _SECONDS[self.rng.randint(5, 15)]
 
     def _do_gacha(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Perform gacha summon."""
@@ -914,7 +934,7 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        timestamp += timedelta(seconds=self.rng.randint(3, 10))
+        timestamp += _SECONDS[self.rng.randint(3, 10)]
 
         # Perform pulls
         num_pulls = pull_info["count"]
@@ -941,19 +961,26 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        # Do each pull
+        # Do each pull; events are emitted together once all pulls are rolled
+        rng = self.rng
+        roll_gacha = self.behavior.roll_gacha
+        get_heroes_by_rarity = self.world.get_heroes_by_rarity
+        soft_pity_start = self.config.soft_pity_start
+        featured = None
+        if banner.featured_hero_id:
+            featured = self.world.get_hero_template(banner.featured_hero_id)
+        pulls = []
         for i in range(num_pulls):
             pity_before = agent.pity_counter
-            rarity = self.behavior.roll_gacha(agent, self.rng)
+            rarity = roll_gacha(agent, rng)
 
             # Get hero
-            heroes_pool = self.world.get_heroes_by_rarity(rarity)
-            hero_template = self.rng.choice(heroes_pool)
+            heroes_pool = get_heroes_by_rarity(rarity)
+            hero_template = rng.choice(heroes_pool)
 
             # Featured hero chance
             if banner.featured_hero_id and rarity == HeroRarity.LEGENDARY:
-                if self.rng.random() < 0.5:  # 50% to be featured
-                    featured = self.world.get_hero_template(banner.featured_hero_id)
+                if rng.random() < 0.5:  # 50% to be featured
                     if featured:
                         hero_template = featured
 
@@ -963,7 +990,7 @@ class Simulator:
             # Update pity
             pity_triggered = False
             if rarity == HeroRarity.LEGENDARY:
-                pity_triggered = pity_before >= self.config.soft_pity_start
+                pity_triggered = pity_before >= soft_pity_start
                 agent.pity_counter = 0
                 agent.got_legendary_recently = True
             else:
@@ -971,35 +998,25 @@ class Simulator:
 
             agent.total_gacha_pulls += 1
 
-            self.emitter.emit_gacha_summon(
-                agent=agent,
-                timestamp=timestamp,
-                current_date=self.current_date,
-                banner=banner,
-                summon_type="multi_10" if num_pulls == 10 else "single",
-                summon_index=i + 1,
-                summon_cost_currency="summon_tickets" if currency == "tickets" else "gems",
-                summon_cost_amount=cost if i == 0 else 0,
-                hero=hero_template,
-                is_new=is_new,
-                is_duplicate=not is_new,
-                pity_counter_before=pity_before,
-                pity_counter_after=agent.pity_counter,
-                pity_triggered=pity_triggered,
+            pulls.append(
+                (timestamp, hero_template, is_new, pity_before, agent.pity_counter, pity_triggered)
             )
-            agent.current_session_events += 1
 
-            timestamp += timedelta(seconds=self.rng.randint(1, 3))
+            timestamp += _SECONDS[rng.randint(1, 3)]
 
-        # Update team power
-        agent.calculate_team_power()
+        self.emitter.emit_gacha_summon_batch(
+            agent=agent,
+            current_date=self.current_date,
+            banner=banner,
+            summon_type="multi_10" if num_pulls == 10 else "single",
+            summon_cost_currency="summon_tickets" if currency == "tickets" else "gems",
+            summon_cost_amount=cost,
+            pulls=pulls,
+        )
+        agent.current_session_events += num_pulls
 
         # Update daily quest
-        for quest in agent.daily_quests:
-            if quest.quest_id == "dq_gacha" and not quest.completed:
-                quest.current += num_pulls
-                if quest.current >= quest.target:
-                    quest.completed = True
+        agent.progress_daily_quest("dq_gacha", num_pulls)
 
         return timestamp
 
@@ -1049,7 +1066,7 @@ class Simulator:
 
         # Battle
         duration = self.rng.randint(30, 90)
-        end_time = timestamp + timedelta(seconds=duration)
+        end_time = timestamp + _SECONDS[duration]
 
         won = self.behavior.simulate_arena_result(agent, opponent_power, self.rng)
         rating_change = self.behavior.calculate_arena_rating_change(
@@ -1095,11 +1112,7 @@ class Simulator:
             agent.current_session_events += 1
 
             # Update quest
-            for quest in agent.daily_quests:
-                if quest.quest_id == "dq_arena" and not quest.completed:
-                    quest.current += 1
-                    if quest.current >= quest.target:
-                        quest.completed = True
+            agent.progress_daily_quest("dq_arena")
 
         return end_time
 
@@ -1108,12 +1121,7 @@ class Simulator:
         if not agent.guild_id or agent.attacked_guild_boss_today:
             return timestamp
 
-        guild = None
-        for g in self.world.guilds:
-            if g.guild_id == agent.guild_id:
-                guild = g
-                break
-
+        guild = self.world.get_guild(agent.guild_id)
         if not guild:
             return timestamp
 
@@ -1155,7 +1163,7 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        return timestamp + timedelta(seconds=self.rng.randint(30, 60))
+        return timestamp + _SECONDS[self.rng.randint(30, 60)]
 
     def _join_guild(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Join a guild."""
@@ -1179,14 +1187,14 @@ class Simulator:
             )
             agent.current_session_events += 1
 
-        return timestamp + timedelta(seconds=self.rng.randint(10, 30))
+        return timestamp + _SECONDS[self.rng.randint(10, 30)]
 
     def _watch_ad(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Watch rewarded ad."""
         if agent.ads_watched_today >= self.config.max_ads_per_day:
             return timestamp
 
-        placement = self.rng.choice(["main_screen", "shop", "energy_refill"])
+        placement = self.rng.choice(AD_PLACEMENTS)
         ad_network = self.rng.choice(AD_NETWORKS)
 
         # Ad opportunity
@@ -1200,7 +1208,7 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        timestamp += timedelta(seconds=2)
+        timestamp += _SECONDS[2]
 
         # Ad started
         self.emitter.emit_ad_started(
@@ -1217,7 +1225,7 @@ class Simulator:
             skip_time = self.rng.randint(5, 15)
             self.emitter.emit_ad_skipped(
                 agent=agent,
-                timestamp=timestamp + timedelta(seconds=skip_time),
+                timestamp=timestamp + _SECONDS[skip_time],
                 current_date=self.current_date,
                 placement=placement,
                 ad_network=ad_network,
@@ -1225,18 +1233,16 @@ class Simulator:
                 skip_reason="user_closed",
             )
             agent.current_session_events += 1
-            return timestamp + timedelta(seconds=skip_time)
+            return timestamp + _SECONDS[skip_time]
 
         # Complete
         watch_duration = self.rng.randint(15, 30)
-        end_time = timestamp + timedelta(seconds=watch_duration)
+        end_time = timestamp + _SECONDS[watch_duration]
 
         # Get reward amount (may vary by A/B test)
-        reward_amount = self.config.ad_reward_gems
-        ad_test = agent.ab_tests.get("ad_reward_amount")
-        if ad_test:
-            effects = self.config.ab_tests.get("ad_reward_amount", {}).get("effects", {})
-            reward_amount = effects.get(ad_test, {}).get("reward_gems", reward_amount)
+        reward_amount = self.config.ad_reward_gems_by_variant.get(
+            agent.ab_tests.get("ad_reward_amount"), self.config.ad_reward_gems
+        )
 
         agent.gems += reward_amount
         agent.ads_watched_today += 1
@@ -1268,7 +1274,7 @@ class Simulator:
 
     def _browse_shop(self, agent: AgentState, timestamp: datetime) -> datetime:
         """Browse shop and potentially make purchase."""
-        tab = self.rng.choice(["iap", "gems", "daily", "special"])
+        tab = self.rng.choice(SHOP_TABS)
 
         self.emitter.emit_shop_view(
             agent=agent,
@@ -1279,7 +1285,7 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        timestamp += timedelta(seconds=self.rng.randint(5, 20))
+        timestamp += _SECONDS[self.rng.randint(5, 20)]
 
         # Check for IAP trigger
         trigger = None
@@ -1291,7 +1297,7 @@ class Simulator:
             trigger = "out_of_energy"
         elif not agent.has_active_monthly and self.rng.random() < 0.3:
             trigger = "monthly_pass_reminder"
-        elif (self.current_date - agent.install_date).days >= 30:
+        elif self.current_ordinal - agent.install_ordinal >= 30:
             trigger = "late_game_offer"
 
         if trigger and self.behavior.should_attempt_iap(agent, trigger, self.rng):
@@ -1309,10 +1315,9 @@ class Simulator:
 
         # A/B test starter pack price
         if product_id == "starter_pack":
-            test = agent.ab_tests.get("starter_pack_price")
-            if test:
-                effects = self.config.ab_tests.get("starter_pack_price", {}).get("effects", {})
-                price = effects.get(test, {}).get("price_usd", price)
+            price = self.config.starter_pack_price_by_variant.get(
+                agent.ab_tests.get("starter_pack_price"), price
+            )
 
         # Initiated
         self.emitter.emit_iap_initiated(
@@ -1325,11 +1330,11 @@ class Simulator:
         )
         agent.current_session_events += 1
 
-        timestamp += timedelta(seconds=self.rng.randint(5, 15))
+        timestamp += _SECONDS[self.rng.randint(5, 15)]
 
         # Chance to fail/cancel
         if self.rng.random() < 0.1:  # 10% fail
-            reason = self.rng.choice(["cancelled", "payment_error", "network_error"])
+            reason = self.rng.choice(IAP_FAIL_REASONS)
             self.emitter.emit_iap_failed(
                 agent=agent,
                 timestamp=timestamp,
@@ -1400,11 +1405,12 @@ class Simulator:
 
     def _check_level_up(self, agent: AgentState, timestamp: datetime) -> None:
         """Check and process player level up."""
+        exp_for_level = self.world.exp_for_level
         while True:
-            exp_needed = self.world.get_exp_for_level(agent.player_level + 1)
+            exp_needed = exp_for_level[agent.player_level + 1]
             if agent.player_exp < exp_needed:
                 break
-            if agent.player_level >= 100:
+            if agent.player_level >= MAX_PLAYER_LEVEL:
                 break
 
             old_level = agent.player_level
@@ -1412,10 +1418,7 @@ class Simulator:
             agent.player_level += 1
 
             # Check unlocks
-            unlocks = []
-            for feature, level in self.config.feature_unlocks.items():
-                if level == agent.player_level:
-                    unlocks.append(feature)
+            unlocks = list(self.config.unlocks_by_level.get(agent.player_level, ()))
 
             self.emitter.emit_player_levelup(
                 agent=agent,
@@ -1429,6 +1432,4 @@ class Simulator:
 
     def _flush_events(self) -> None:
         """Write accumulated events to output."""
-        events = self.emitter.get_events()
-        self.output.write_events(events)
-        self.emitter.clear()
+        self.emitter.flush()
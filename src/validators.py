@@ -3,6 +3,27 @@
 from typing import Optional
 
 
+# Top-level config sections, in the order missing ones are reported
+REQUIRED_SECTIONS = (
+    "simulation",
+    "installs",
+    "player_types",
+    "economy",
+    "gacha",
+    "shop",
+    "vip",
+    "progression",
+    "heroes",
+    "social",
+    "output",
+    "devices",
+)
+_REQUIRED_SECTION_SET = frozenset(REQUIRED_SECTIONS)
+
+# Shared default for missing subsections; the checks only read from it
+_EMPTY: dict = {}
+
+
 class ValidationError(Exception):
     """Configuration validation error."""
 
@@ -23,16 +44,27 @@ class ConfigValidator:
         self.errors = []
 
         self._validate_required_sections()
-        self._validate_simulation_params()
-        self._validate_player_type_shares()
-        self._validate_install_source_shares()
-        self._validate_retention_order()
-        self._validate_platform_shares()
-        self._validate_country_shares()
-        self._validate_gacha_rates()
-        self._validate_ab_test_weights()
-        self._validate_references()
-        self._validate_numeric_ranges()
+        if self.errors:
+            # The remaining checks would only report on the missing sections
+            return self.errors
+
+        # Required sections are present from here on; fetch each one once
+        config = self.config
+        player_types = config["player_types"]
+        installs = config["installs"]
+        devices = config["devices"]
+        gacha = config["gacha"]
+
+        self._validate_simulation_params(config["simulation"])
+        self._validate_player_type_shares(player_types)
+        self._validate_install_source_shares(installs)
+        self._validate_retention_order(player_types)
+        self._validate_platform_shares(devices)
+        self._validate_country_shares(devices)
+        self._validate_gacha_rates(gacha)
+        self._validate_ab_test_weights(config.get("ab_tests", _EMPTY))
+        self._validate_references(config["progression"])
+        self._validate_numeric_ranges(installs, gacha, config["vip"])
 
         return self.errors
 
@@ -44,27 +76,14 @@ class ConfigValidator:
 
     def _validate_required_sections(self) -> None:
         """Check that all required top-level sections exist."""
-        required_sections = [
-            "simulation",
-            "installs",
-            "player_types",
-            "economy",
-            "gacha",
-            "shop",
-            "vip",
-            "progression",
-            "heroes",
-            "social",
-            "output",
-            "devices",
-        ]
-        for section in required_sections:
+        if self.config.keys() >= _REQUIRED_SECTION_SET:
+            return
+        for section in REQUIRED_SECTIONS:
             if section not in self.config:
                 self.errors.append(f"Missing required section: {section}")
 
-    def _validate_simulation_params(self) -> None:
+    def _validate_simulation_params(self, sim: dict) -> None:
         """Validate simulation parameters."""
-        sim = self.config.get("simulation", {})
 
         if "seed" not in sim:
             self.errors.append("simulation.seed is required")
@@ -101,19 +120,18 @@ class ConfigValidator:
                 f"{path} shares sum to {total:.4f}, expected {expected_sum}"
             )
 
-    def _validate_player_type_shares(self) -> None:
+    def _validate_player_type_shares(self, player_types: dict) -> None:
         """Validate player type shares sum to 1.0."""
-        player_types = self.config.get("player_types", {})
         self._validate_share_sum(player_types, "player_types")
 
-    def _validate_install_source_shares(self) -> None:
+    def _validate_install_source_shares(self, installs: dict) -> None:
         """Validate install source shares sum to 1.0."""
-        sources = self.config.get("installs", {}).get("sources", {})
+        sources = installs.get("sources", _EMPTY)
         self._validate_share_sum(sources, "installs.sources")
 
-    def _validate_platform_shares(self) -> None:
+    def _validate_platform_shares(self, devices: dict) -> None:
         """Validate platform shares sum to 1.0."""
-        platforms = self.config.get("devices", {}).get("platforms", {})
+        platforms = devices.get("platforms", _EMPTY)
         if platforms:
             total = sum(platforms.values())
             if abs(total - 1.0) > 0.01:
@@ -121,9 +139,9 @@ class ConfigValidator:
                     f"devices.platforms shares sum to {total:.4f}, expected 1.0"
                 )
 
-    def _validate_country_shares(self) -> None:
+    def _validate_country_shares(self, devices: dict) -> None:
         """Validate country shares sum to 1.0."""
-        countries = self.config.get("devices", {}).get("countries", {})
+        countries = devices.get("countries", _EMPTY)
         if countries:
             total = sum(countries.values())
             if abs(total - 1.0) > 0.01:
@@ -131,9 +149,9 @@ class ConfigValidator:
                     f"devices.countries shares sum to {total:.4f}, expected 1.0"
                 )
 
-    def _validate_gacha_rates(self) -> None:
+    def _validate_gacha_rates(self, gacha: dict) -> None:
         """Validate gacha rates sum to 1.0."""
-        rates = self.config.get("gacha", {}).get("rates", {})
+        rates = gacha.get("rates", _EMPTY)
         if rates:
             total = sum(rates.values())
             if abs(total - 1.0) > 0.01:
@@ -141,12 +159,10 @@ class ConfigValidator:
                     f"gacha.rates sum to {total:.4f}, expected 1.0"
                 )
 
-    def _validate_retention_order(self) -> None:
+    def _validate_retention_order(self, player_types: dict) -> None:
         """Validate that retention decreases over time for each player type."""
-        player_types = self.config.get("player_types", {})
-
         for name, pt in player_types.items():
-            ret = pt.get("retention", {})
+            ret = pt.get("retention", _EMPTY)
             d1 = ret.get("d1", 1.0)
             d7 = ret.get("d7", 0.0)
             d30 = ret.get("d30", 0.0)
@@ -158,17 +174,17 @@ class ConfigValidator:
                     f"(got d1={d1}, d7={d7}, d30={d30}, d90={d90})"
                 )
 
-            # Validate ranges
-            for day, value in [("d1", d1), ("d7", d7), ("d30", d30), ("d90", d90)]:
-                if not (0 <= value <= 1):
-                    self.errors.append(
-                        f"player_type '{name}': retention.{day} must be between 0 and 1"
-                    )
+            # Validate ranges; only walk the days to name them when one is off
+            # (chained comparisons, unlike min()/max(), also reject NaN)
+            if not (0 <= d1 <= 1 and 0 <= d7 <= 1 and 0 <= d30 <= 1 and 0 <= d90 <= 1):
+                for day, value in (("d1", d1), ("d7", d7), ("d30", d30), ("d90", d90)):
+                    if not (0 <= value <= 1):
+                        self.errors.append(
+                            f"player_type '{name}': retention.{day} must be between 0 and 1"
+                        )
 
-    def _validate_ab_test_weights(self) -> None:
+    def _validate_ab_test_weights(self, ab_tests: dict) -> None:
         """Validate A/B test variant weights sum to 1.0."""
-        ab_tests = self.config.get("ab_tests", {})
-
         for test_name, test_config in ab_tests.items():
             if not test_config.get("enabled", False):
                 continue
@@ -188,10 +204,10 @@ class ConfigValidator:
                     f"ab_tests.{test_name}: weights sum to {total:.4f}, expected 1.0"
                 )
 
-    def _validate_references(self) -> None:
+    def _validate_references(self, progression: dict) -> None:
         """Validate cross-references in configuration."""
-        unlocks = self.config.get("progression", {}).get("unlocks", {})
-        max_level = self.config.get("progression", {}).get("player_level", {}).get("max", 100)
+        unlocks = progression.get("unlocks", _EMPTY)
+        max_level = progression.get("player_level", _EMPTY).get("max", 100)
 
         for feature, level in unlocks.items():
             if level > max_level:
@@ -199,17 +215,15 @@ class ConfigValidator:
                     f"progression.unlocks.{feature} ({level}) > player_level.max ({max_level})"
                 )
 
-    def _validate_numeric_ranges(self) -> None:
+    def _validate_numeric_ranges(self, installs: dict, gacha: dict, vip: dict) -> None:
         """Validate numeric values are in reasonable ranges."""
-        installs = self.config.get("installs", {})
         if "total" in installs:
             if installs["total"] < 100:
                 self.errors.append("installs.total should be at least 100")
             if installs["total"] > 10_000_000:
                 self.errors.append("installs.total should be at most 10,000,000")
 
-        gacha = self.config.get("gacha", {})
-        pity = gacha.get("pity", {})
+        pity = gacha.get("pity", _EMPTY)
         if pity:
             threshold = pity.get("threshold", 90)
             soft_start = pity.get("soft_pity_start", 75)
@@ -219,7 +233,7 @@ class ConfigValidator:
                 )
 
         # Validate VIP thresholds are increasing
-        vip_levels = self.config.get("vip", {}).get("levels", {})
+        vip_levels = vip.get("levels", _EMPTY)
         prev_threshold = -1
         for level in sorted(vip_levels.keys(), key=int):
             threshold = vip_levels[level].get("threshold", 0)
@@ -16,47 +16,99 @@ from .models import (
 )
 
 
+# Heroes stop levelling up at this level
+MAX_HERO_LEVEL = 100
+MAX_PLAYER_LEVEL = 100
+
 # Hero name generators by class
 HERO_NAMES = {
-    HeroClass.WARRIOR: [
+    HeroClass.WARRIOR: (
         "Blade Master", "Iron Knight", "Steel Guardian", "War Chief",
         "Battle Titan", "Sword Saint", "Crusader", "Berserker",
         "Champion", "Gladiator", "Warlord", "Paladin",
         "Vanguard", "Sentinel", "Defender", "Conqueror",
         "Ravager", "Slayer", "Reaver", "Destroyer",
-    ],
-    HeroClass.MAGE: [
+    ),
+    HeroClass.MAGE: (
         "Frost Witch", "Fire Sage", "Storm Caller", "Archmage",
         "Void Walker", "Crystal Seer", "Shadow Weaver", "Light Bringer",
         "Elementalist", "Enchanter", "Sorcerer", "Wizard",
         "Necromancer", "Illusionist", "Conjurer", "Warlock",
         "Mystic", "Oracle", "Diviner", "Spellbinder",
-    ],
-    HeroClass.ARCHER: [
+    ),
+    HeroClass.ARCHER: (
         "Eagle Eye", "Swift Arrow", "Wind Runner", "Shadow Hunter",
         "Forest Ranger", "Sniper", "Marksman", "Sharpshooter",
         "Tracker", "Scout", "Pathfinder", "Stalker",
         "Hawk Eye", "Silent Shot", "Death Dealer", "Venomstrike",
         "Crossbow Master", "Bow Master", "Hunter", "Predator",
-    ],
-    HeroClass.HEALER: [
+    ),
+    HeroClass.HEALER: (
         "Life Keeper", "Holy Priest", "Light Bearer", "Soul Mender",
         "Nature's Grace", "Divine Touch", "Restoration Master", "Mercy",
         "Cleric", "Bishop", "Saint", "Seraph",
         "Medicine Woman", "Shaman", "Druid", "Herbalist",
         "Angel", "Guardian Spirit", "Beacon", "Hope Bringer",
-    ],
-    HeroClass.TANK: [
+    ),
+    HeroClass.TANK: (
         "Stone Wall", "Iron Fortress", "Shield Bearer", "Mountain Guard",
         "Bulwark", "Rampart", "Bastion", "Colossus",
         "Golem", "Juggernaut", "Behemoth", "Titan",
         "Protector", "Aegis", "Barrier", "Fortress",
         "Earthshaker", "Rock Solid", "Immovable", "Anchor",
-    ],
+    ),
+}
+
+# Guild name parts
+GUILD_PREFIXES = (
+    "Royal", "Shadow", "Dragon", "Phoenix", "Iron",
+    "Golden", "Silver", "Dark", "Light", "Storm",
+    "Fire", "Ice", "Thunder", "Crystal", "Ancient",
+)
+GUILD_SUFFIXES = (
+    "Knights", "Legion", "Order", "Guard", "Warriors",
+    "Hunters", "Raiders", "Champions", "Defenders", "Alliance",
+    "Brigade", "Battalion", "Corps", "Squad", "Force",
+)
+
+# Milestone templates per game event type
+GAME_EVENT_MILESTONES = {
+    "login_event": tuple(
+        {
+            "day": d,
+            "reward_currency": "gems" if d % 3 == 0 else "gold",
+            "reward_amount": 50 * d if d % 3 == 0 else 500 * d,
+        }
+        for d in range(1, 8)
+    ),
+    "summon_event": tuple(
+        {
+            "pulls_required": pulls,
+            "reward_currency": "summon_tickets",
+            "reward_amount": pulls // 10,
+        }
+        for pulls in (10, 30, 50, 100)
+    ),
+    "spending_event": tuple(
+        {
+            "spend_usd": spend,
+            "reward_currency": "gems",
+            "reward_amount": spend * 20,
+        }
+        for spend in (5, 20, 50, 100)
+    ),
+    "collection_event": tuple(
+        {
+            "tokens_required": tokens,
+            "reward_currency": "gems",
+            "reward_amount": tokens // 5,
+        }
+        for tokens in (100, 300, 500, 1000)
+    ),
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldState:
     """Global state of the game world."""
 
@@ -64,14 +116,19 @@ class WorldState:
     current_date: date
     day_number: int = 1
 
-    # Hero templates (static, generated once)
+    # Hero templates (static, generated once; heroes_by_rarity groups the same objects)
     hero_templates: dict[str, HeroTemplate] = field(default_factory=dict)
+    heroes_by_rarity: dict[HeroRarity, list[HeroTemplate]] = field(default_factory=dict)
 
-    # Guilds
+    # Guilds (guilds_by_id indexes the same objects; open_guilds holds the
+    # ones with space, in guilds order)
     guilds: list[Guild] = field(default_factory=list)
+    guilds_by_id: dict[str, Guild] = field(default_factory=dict)
+    open_guilds: list[Guild] = field(default_factory=list)
 
-    # Gacha banners
+    # Gacha banners (standard_banner is the one always-on entry of banners)
     banners: list[GachaBanner] = field(default_factory=list)
+    standard_banner: Optional[GachaBanner] = None
 
     # Active game events
     game_events: list[GameEvent] = field(default_factory=list)
@@ -80,14 +137,34 @@ class WorldState:
     total_installs: int = 0
     total_events_generated: int = 0
 
+    # get_levelup_cost(level) for every level a hero can still level up from
+    levelup_costs: tuple[int, ...] = field(default=(), init=False, repr=False)
+    # get_exp_for_level(level) for every level up to one past the player cap
+    exp_for_level: tuple[int, ...] = field(default=(), init=False, repr=False)
+    # Stage power requirement by overall stage number (1-based; index 0 unused)
+    _stage_power: tuple[int, ...] = field(default=(), init=False, repr=False)
+
+    # Active banner/event lists, keyed by the date they were computed for
+    _active_banners: tuple = field(default=(None, ()), init=False, repr=False)
+    _active_events: tuple = field(default=(None, ()), init=False, repr=False)
+
     def __post_init__(self):
         """Initialize world state."""
-        pass
+        self.levelup_costs = tuple(
+            self.get_levelup_cost(level) for level in range(MAX_HERO_LEVEL)
+        )
+        self.exp_for_level = tuple(
+            self.get_exp_for_level(level) for level in range(MAX_PLAYER_LEVEL + 2)
+        )
+        total_stages = self.config.total_chapters * self.config.stages_per_chapter
+        self._stage_power = tuple(
+            self._compute_stage_power(stage_num) for stage_num in range(total_stages + 1)
+        )
 
     @classmethod
     def initialize(cls, config: SimulationConfig, rng: Random) -> "WorldState":
         """Create and initialize a new world state."""
-        start_date = date.fromisoformat(config.start_date)
+        start_date = config.start_day
         world = cls(config=config, current_date=start_date, day_number=1)
 
         # Generate hero templates
@@ -131,26 +208,16 @@ class WorldState:
                     base_power=base_power,
                 )
                 self.hero_templates[hero_id] = template
+                self.heroes_by_rarity.setdefault(rarity, []).append(template)
 
     def _generate_guilds(self, rng: Random) -> None:
         """Generate all guilds."""
         guild_count = self.config.guild_count
         max_members = self.config.guild_max_members
 
-        guild_prefixes = [
-            "Royal", "Shadow", "Dragon", "Phoenix", "Iron",
-            "Golden", "Silver", "Dark", "Light", "Storm",
-            "Fire", "Ice", "Thunder", "Crystal", "Ancient",
-        ]
-        guild_suffixes = [
-            "Knights", "Legion", "Order", "Guard", "Warriors",
-            "Hunters", "Raiders", "Champions", "Defenders", "Alliance",
-            "Brigade", "Battalion", "Corps", "Squad", "Force",
-        ]
-
         for i in range(1, guild_count + 1):
-            prefix = rng.choice(guild_prefixes)
-            suffix = rng.choice(guild_suffixes)
+            prefix = rng.choice(GUILD_PREFIXES)
+            suffix = rng.choice(GUILD_SUFFIXES)
             name = f"{prefix} {suffix}"
 
             guild = Guild(
@@ -162,10 +229,12 @@ class WorldState:
                 boss_hp_remaining_pct=100.0,
             )
             self.guilds.append(guild)
+            self.guilds_by_id[guild.guild_id] = guild
+        self.open_guilds = [g for g in self.guilds if not g.is_full()]
 
     def _generate_banners(self, rng: Random) -> None:
         """Generate gacha banners for the simulation period."""
-        start_date = date.fromisoformat(self.config.start_date)
+        start_date = self.config.start_day
         end_date = start_date + timedelta(days=self.config.duration_days)
 
         # Standard banner (always active)
@@ -177,12 +246,10 @@ class WorldState:
             end_date=end_date,
         )
         self.banners.append(standard_banner)
+        self.standard_banner = standard_banner
 
         # Limited banners (rotate every 14 days)
-        legendary_heroes = [
-            h for h in self.hero_templates.values()
-            if h.rarity == HeroRarity.LEGENDARY
-        ]
+        legendary_heroes = self.get_heroes_by_rarity(HeroRarity.LEGENDARY)
 
         current = start_date
         banner_num = 1
@@ -204,7 +271,7 @@ class WorldState:
 
     def _generate_game_events(self, rng: Random) -> None:
         """Generate temporary game events for the simulation period."""
-        start_date = date.fromisoformat(self.config.start_date)
+        start_date = self.config.start_day
         end_date = start_date + timedelta(days=self.config.duration_days)
 
         event_types = ["login_event", "summon_event", "spending_event", "collection_event"]
@@ -227,36 +294,11 @@ class WorldState:
             duration = rng.randint(7, 14)
             event_end = min(current + timedelta(days=duration), end_date)
 
-            # Generate milestones
-            milestones = []
+            # Milestones (login events only get one per day, up to a week)
+            template = GAME_EVENT_MILESTONES.get(event_type, ())
             if event_type == "login_event":
-                for d in range(1, min(duration + 1, 8)):
-                    milestones.append({
-                        "day": d,
-                        "reward_currency": "gems" if d % 3 == 0 else "gold",
-                        "reward_amount": 50 * d if d % 3 == 0 else 500 * d,
-                    })
-            elif event_type == "summon_event":
-                for pulls in [10, 30, 50, 100]:
-                    milestones.append({
-                        "pulls_required": pulls,
-                        "reward_currency": "summon_tickets",
-                        "reward_amount": pulls // 10,
-                    })
-            elif event_type == "spending_event":
-                for spend in [5, 20, 50, 100]:
-                    milestones.append({
-                        "spend_usd": spend,
-                        "reward_currency": "gems",
-                        "reward_amount": spend * 20,
-                    })
-            elif event_type == "collection_event":
-                for tokens in [100, 300, 500, 1000]:
-                    milestones.append({
-                        "tokens_required": tokens,
-                        "reward_currency": "gems",
-                        "reward_amount": tokens // 5,
-                    })
+                template = template[:duration]
+            milestones = [dict(m) for m in template]
 
             game_event = GameEvent(
                 event_id=f"event_{event_num:03d}",
@@ -282,12 +324,28 @@ class WorldState:
             guild.boss_hp_remaining_pct = 100.0
 
     def get_active_banners(self) -> list[GachaBanner]:
-        """Get all active banners for current date."""
-        return [b for b in self.banners if b.is_active(self.current_date)]
+        """Get all active banners for current date.
+
+        The list is computed once per date and shared; do not mutate it.
+        """
+        today = self.current_date
+        cached_date, active = self._active_banners
+        if cached_date != today:
+            active = [b for b in self.banners if b.is_active(today)]
+            self._active_banners = (today, active)
+        return active
 
     def get_active_events(self) -> list[GameEvent]:
-        """Get all active game events for current date."""
-        return [e for e in self.game_events if e.is_active(self.current_date)]
+        """Get all active game events for current date.
+
+        The list is computed once per date and shared; do not mutate it.
+        """
+        today = self.current_date
+        cached_date, active = self._active_events
+        if cached_date != today:
+            active = [e for e in self.game_events if e.start_date <= today <= e.end_date]
+            self._active_events = (today, active)
+        return active
 
     def get_limited_banner(self) -> Optional[GachaBanner]:
         """Get the current limited banner, if any."""
@@ -299,59 +357,72 @@ class WorldState:
 
     def get_standard_banner(self) -> Optional[GachaBanner]:
         """Get the standard banner."""
-        for banner in self.banners:
-            if banner.banner_type == "standard":
-                return banner
-        return None
+        return self.standard_banner
 
     def get_hero_template(self, hero_id: str) -> Optional[HeroTemplate]:
         """Get a hero template by ID."""
         return self.hero_templates.get(hero_id)
 
     def get_heroes_by_rarity(self, rarity: HeroRarity) -> list[HeroTemplate]:
-        """Get all hero templates of a specific rarity."""
-        return [h for h in self.hero_templates.values() if h.rarity == rarity]
+        """Get all hero templates of a specific rarity.
+
+        The returned list is shared; callers must not mutate it.
+        """
+        return self.heroes_by_rarity.get(rarity, [])
 
     def get_random_guild(self, rng: Random) -> Optional[Guild]:
         """Get a random guild that has space."""
-        available = [g for g in self.guilds if not g.is_full()]
-        if available:
-            return rng.choice(available)
+        if self.open_guilds:
+            return rng.choice(self.open_guilds)
         return None
 
+    def get_guild(self, guild_id: str) -> Optional[Guild]:
+        """Get a guild by ID."""
+        return self.guilds_by_id.get(guild_id)
+
     def join_guild(self, guild_id: str) -> bool:
         """Add a member to a guild."""
-        for guild in self.guilds:
-            if guild.guild_id == guild_id:
-                if not guild.is_full():
-                    guild.member_count += 1
-                    return True
+        guild = self.guilds_by_id.get(guild_id)
+        if guild is not None and guild.member_count < guild.max_members:
+            guild.member_count += 1
+            if guild.member_count >= guild.max_members:
+                self.open_guilds.remove(guild)
+            return True
         return False
 
     def leave_guild(self, guild_id: str) -> bool:
         """Remove a member from a guild."""
-        for guild in self.guilds:
-            if guild.guild_id == guild_id:
-                if guild.member_count > 0:
-                    guild.member_count -= 1
-                    return True
+        guild = self.guilds_by_id.get(guild_id)
+        if guild is not None and guild.member_count > 0:
+            was_full = guild.is_full()
+            guild.member_count -= 1
+            if was_full:
+                # Rare; rebuild to keep guilds order for get_random_guild
+                self.open_guilds = [g for g in self.guilds if not g.is_full()]
+            return True
         return False
 
     def damage_guild_boss(self, guild_id: str, damage_pct: float) -> float:
         """Deal damage to a guild boss. Returns remaining HP percentage."""
-        for guild in self.guilds:
-            if guild.guild_id == guild_id:
-                guild.boss_hp_remaining_pct = max(0, guild.boss_hp_remaining_pct - damage_pct)
-                if guild.boss_hp_remaining_pct <= 0:
-                    # Boss defeated, level up
-                    guild.boss_level += 1
-                    guild.boss_hp_remaining_pct = 100.0
-                return guild.boss_hp_remaining_pct
-        return 100.0
+        guild = self.guilds_by_id.get(guild_id)
+        if guild is None:
+            return 100.0
+        guild.boss_hp_remaining_pct = max(0, guild.boss_hp_remaining_pct - damage_pct)
+        if guild.boss_hp_remaining_pct <= 0:
+            # Boss defeated, level up
+            guild.boss_level += 1
+            guild.boss_hp_remaining_pct = 100.0
+        return guild.boss_hp_remaining_pct
 
     def get_stage_power_requirement(self, chapter: int, stage: int) -> int:
         """Calculate power requirement for a stage."""
         stage_num = (chapter - 1) * self.config.stages_per_chapter + stage
+        if 0 < stage_num < len(self._stage_power):
+            return self._stage_power[stage_num]
+        return self._compute_stage_power(stage_num)
+
+    def _compute_stage_power(self, stage_num: int) -> int:
+        """Power requirement formula for an overall stage number."""
         base = self.config.progression.get("stage_power", {}).get("base", 100)
         mult = self.config.progression.get("stage_power", {}).get("per_stage_mult", 1.08)
         return int(base * (mult ** (stage_num - 1)))
@@ -3,6 +3,9 @@
 import gzip
 import json
 import hashlib
+import queue
+import threading
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -10,9 +13,67 @@ from typing import Any, Optional
 import pyarrow as pa
 import pyarrow.parquet as pq
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
 from .models import Event
 from .config import SimulationConfig
 
+# JSONL file extension per supported compression codec
+JSONL_EXTENSIONS = {
+    "gzip": ".jsonl.gz",
+    "zstd": ".jsonl.zst",
+    "lz4": ".jsonl.lz4",
+}
+
+
+class _BackgroundSink:
+    """Runs a writer's file writes on a dedicated thread.
+
+    Payloads go through a bounded queue, so the simulation keeps generating
+    while gzip/Parquet encoding runs (both release the GIL). Writes happen
+    in submission order; an error on the thread is re-raised by the next
+    submit() or close().
+    """
+
+    _STOP = object()
+
+    def __init__(self, write, name: str, maxsize: int = 8):
+        self._write = write
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            payload = self._queue.get()
+            if payload is self._STOP:
+                return
+            if self._error is None:
+                try:
+                    self._write(payload)
+                except BaseException as e:  # surfaced on the caller's thread
+                    self._error = e
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, payload: Any) -> None:
+        """Queue a payload for writing (blocks while the queue is full)."""
+        self._raise_error()
+        self._queue.put(payload)
+
+    def close(self) -> None:
+        """Drain pending writes and stop the thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._raise_error()
+
 
 class JSONLWriter:
     """Writer for JSONL output format."""
@@ -22,13 +83,18 @@ class JSONLWriter:
         output_path: Path,
         compress: bool = True,
         batch_size: int = 10000,
+        compresslevel: int = 6,
+        codec: str = "gzip",
     ):
         self.output_path = output_path
         self.compress = compress
         self.batch_size = batch_size
-        self.buffer: list[dict] = []
+        self.compresslevel = compresslevel
+        self.codec = codec
+        self.buffer: list[bytes] = []
         self.total_written = 0
         self._file = None
+        self._sink: Optional[_BackgroundSink] = None
 
     def __enter__(self):
         self._open()
@@ -38,42 +104,58 @@ class JSONLWriter:
         self.close()
 
     def _open(self):
-        """Open the output file."""
-        if self.compress:
-            self._file = gzip.open(self.output_path, "wt", encoding="utf-8")
+        """Open the output file (binary; lines are written as UTF-8 bytes)."""
+        if self.compress and self.codec == "gzip":
+            self._file = gzip.open(self.output_path, "wb", compresslevel=self.compresslevel)
+        elif self.compress:
+            # zstd / lz4 frame streams via pyarrow's bundled codecs
+            self._file = pa.CompressedOutputStream(str(self.output_path), self.codec)
         else:
-            self._file = open(self.output_path, "w", encoding="utf-8")
+            self._file = open(self.output_path, "wb")
+        self._sink = _BackgroundSink(self._file.write, "jsonl-writer")
 
     def write_event(self, event: Event) -> None:
         """Add event to buffer, flush if full."""
-        self.buffer.append(event.to_dict())
+        self.buffer.append(event.to_json_bytes())
 
         if len(self.buffer) >= self.batch_size:
             self._flush()
 
     def write_events(self, events: list[Event]) -> None:
         """Write multiple events."""
+        buffer = self.buffer  # _flush clears it in place
         for event in events:
-            self.write_event(event)
+            buffer.append(event.to_json_bytes())
+            if len(buffer) >= self.batch_size:
+                self._flush()
 
     def _flush(self) -> None:
         """Write buffer to file."""
         if not self.buffer:
             return
 
-        for event_dict in self.buffer:
-            line = json.dumps(event_dict, ensure_ascii=False)
-            self._file.write(line + "\n")
+        self._sink.submit(b"\n".join(self.buffer) + b"\n")
 
         self.total_written += len(self.buffer)
-        self.buffer = []
+        self.buffer.clear()
 
     def close(self) -> None:
-        """Flush remaining events and close file."""
-        self._flush()
-        if self._file:
-            self._file.close()
-            self._file = None
+        """Flush remaining events and close file.
+
+        The file is closed even when a write failed, so the compressed
+        stream still ends with a valid trailer.
+        """
+        try:
+            self._flush()
+        finally:
+            try:
+                if self._sink:
+                    self._sink.close()
+            finally:
+                self._sink = None
+                if self._file:
+                    self._file.close()
+                    self._file = None
 
 
 class ParquetWriter:
@@ -93,12 +175,13 @@ class ParquetWriter:
         ("device_model", pa.string()),
         ("country", pa.string()),
         ("language", pa.string()),
-        ("player_level", pa.int32()),
-        ("vip_level", pa.int32()),
+        # Narrow signed ints sized from the value ranges; pa.array raises on overflow
+        ("player_level", pa.int16()),  # <= MAX_PLAYER_LEVEL (100)
+        ("vip_level", pa.int8()),  # VIP ladder levels, well under 127
         ("total_spent_usd", pa.float32()),
-        ("days_since_install", pa.int32()),
+        ("days_since_install", pa.int16()),  # bounded by duration_days
         ("cohort_date", pa.string()),
-        ("current_chapter", pa.int32()),
+        ("current_chapter", pa.int16()),  # progression.chapters (20 by default)
         ("ab_tests", pa.string()),  # JSON string
         ("event_properties", pa.string()),  # JSON string
     ])
@@ -107,12 +190,20 @@ class ParquetWriter:
         self,
         output_path: Path,
         batch_size: int = 100000,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
     ):
         self.output_path = output_path
         self.batch_size = batch_size
-        self.buffer: list[dict] = []
+        self.compression = compression
+        self.compression_level = compression_level
+        # One tuple per event, values in SCHEMA column order
+        self.buffer: list[tuple] = []
         self.total_written = 0
         self._writer: Optional[pq.ParquetWriter] = None
+        self._sink: Optional[_BackgroundSink] = None
+        # ab_tests JSON by assignment; agents share a few distinct ones
+        self._ab_tests_json: dict[tuple, str] = {}
 
     def __enter__(self):
         self._open()
@@ -123,11 +214,16 @@ class ParquetWriter:
 
     def _open(self):
         """Open the Parquet writer."""
+        level = self.compression_level
+        if level is None and self.compression == "zstd":
+            level = 1  # writes as fast as snappy at about half the size
         self._writer = pq.ParquetWriter(
             self.output_path,
             self.SCHEMA,
-            compression="snappy",
+            compression=self.compression,
+            compression_level=level,
         )
+        self._sink = _BackgroundSink(self._writer.write_batch, "parquet-writer")
 
     def write_event(self, event: Event) -> None:
         """Add event to buffer, flush if full."""
@@ -139,63 +235,82 @@ class ParquetWriter:
 
     def write_events(self, events: list[Event]) -> None:
         """Write multiple events."""
+        buffer = self.buffer  # _flush clears it in place
+        flatten = self._flatten_event
         for event in events:
-            self.write_event(event)
-
-    def _flatten_event(self, event: Event) -> dict:
-        """Flatten nested event structure for Parquet."""
-        event_dict = event.to_dict()
-
-        return {
-            "event_id": event_dict["event_id"],
-            "event_name": event_dict["event_name"],
-            "event_timestamp": datetime.fromisoformat(
-                event_dict["event_timestamp"].rstrip("Z")
-            ),
-            "user_id": event_dict["user_id"],
-            "session_id": event_dict["session_id"],
-            "device_id": event_dict["device"]["device_id"],
-            "platform": event_dict["device"]["platform"],
-            "os_version": event_dict["device"]["os_version"],
-            "app_version": event_dict["device"]["app_version"],
-            "device_model": event_dict["device"]["device_model"],
-            "country": event_dict["device"]["country"],
-            "language": event_dict["device"]["language"],
-            "player_level": event_dict["user_properties"]["player_level"],
-            "vip_level": event_dict["user_properties"]["vip_level"],
-            "total_spent_usd": event_dict["user_properties"]["total_spent_usd"],
-            "days_since_install": event_dict["user_properties"]["days_since_install"],
-            "cohort_date": event_dict["user_properties"]["cohort_date"],
-            "current_chapter": event_dict["user_properties"]["current_chapter"],
-            "ab_tests": json.dumps(event_dict["ab_tests"]),
-            "event_properties": json.dumps(event_dict["event_properties"]),
-        }
+            buffer.append(flatten(event))
+            if len(buffer) >= self.batch_size:
+                self._flush()
+
+    def _flatten_event(self, event: Event) -> tuple:
+        """Flatten nested event structure into a SCHEMA-ordered row.
+
+        Reads the Event directly; the values match those of to_dict().
+        """
+        ab_key = tuple(event.ab_tests.items())
+        ab_tests_json = self._ab_tests_json.get(ab_key)
+        if ab_tests_json is None:
+            ab_tests_json = json.dumps(event.ab_tests)
+            self._ab_tests_json[ab_key] = ab_tests_json
+
+        device = event.device
+        user_properties = event.user_properties
+        return (
+            event.event_id,
+            event.event_name,
+            event.event_timestamp,
+            event.user_id,
+            event.session_id,
+            device.device_id,
+            device.platform,
+            device.os_version,
+            device.app_version,
+            device.device_model,
+            device.country,
+            device.language,
+            user_properties.player_level,
+            user_properties.vip_level,
+            user_properties.total_spent_usd,
+            user_properties.days_since_install,
+            user_properties.cohort_date,
+            user_properties.current_chapter,
+            ab_tests_json,
+            json.dumps(event.event_properties),
+        )
 
     def _flush(self) -> None:
         """Write buffer to Parquet file."""
         if not self.buffer:
             return
 
-        # Convert to columnar format
-        columns = {field.name: [] for field in self.SCHEMA}
-
-        for row in self.buffer:
-            for col_name in columns:
-                columns[col_name].append(row.get(col_name))
-
-        # Create table and write
-        table = pa.table(columns, schema=self.SCHEMA)
-        self._writer.write_table(table)
+        # Transpose rows into columns in one C-level pass, then write
+        columns = [
+            pa.array(values, type=field.type)
+            for field, values in zip(self.SCHEMA, zip(*self.buffer))
+        ]
+        batch = pa.RecordBatch.from_arrays(columns, schema=self.SCHEMA)
+        self._sink.submit(batch)
 
         self.total_written += len(self.buffer)
-        self.buffer = []
+        self.buffer.clear()
 
     def close(self) -> None:
-        """Flush remaining events and close file."""
-        self._flush()
-        if self._writer:
-            self._writer.close()
-            self._writer = None
+        """Flush remaining events and close file.
+
+        The writer is closed even when a write failed, so the file still
+        gets its Parquet footer.
+        """
+        try:
+            self._flush()
+        finally:
+            try:
+                if self._sink:
+                    self._sink.close()
+            finally:
+                self._sink = None
+                if self._writer:
+                    self._writer.close()
+                    self._writer = None
 
 
 class MetadataWriter:
@@ -213,9 +328,9 @@ class MetadataWriter:
                 "total_installs": 0,
                 "total_events": 0,
                 "unique_users": 0,
-                "events_by_type": {},
-                "installs_by_source": {},
-                "installs_by_player_type": {},
+                "events_by_type": Counter(),
+                "installs_by_source": Counter(),
+                "installs_by_player_type": Counter(),
             },
             "config_snapshot": {},
         }
@@ -244,10 +359,15 @@ class MetadataWriter:
 
     def increment_event_count(self, event_name: str, count: int = 1) -> None:
         """Increment event type counter."""
-        self.metadata["stats"]["total_events"] += count
-        if event_name not in self.metadata["stats"]["events_by_type"]:
-            self.metadata["stats"]["events_by_type"][event_name] = 0
-        self.metadata["stats"]["events_by_type"][event_name] += count
+        stats = self.metadata["stats"]
+        stats["total_events"] += count
+        stats["events_by_type"][event_name] += count
+
+    def count_events(self, events: list[Event]) -> None:
+        """Count a batch of events by type."""
+        stats = self.metadata["stats"]
+        stats["total_events"] += len(events)
+        stats["events_by_type"].update(event.event_name for event in events)
 
     def increment_installs(
         self,
@@ -256,20 +376,22 @@ class MetadataWriter:
         count: int = 1,
     ) -> None:
         """Increment install counters."""
-        self.metadata["stats"]["total_installs"] += count
-        self.metadata["stats"]["unique_users"] += count
-
-        if source not in self.metadata["stats"]["installs_by_source"]:
-            self.metadata["stats"]["installs_by_source"][source] = 0
-        self.metadata["stats"]["installs_by_source"][source] += count
-
-        if player_type not in self.metadata["stats"]["installs_by_player_type"]:
-            self.metadata["stats"]["installs_by_player_type"][player_type] = 0
-        self.metadata["stats"]["installs_by_player_type"][player_type] += count
+        stats = self.metadata["stats"]
+        stats["total_installs"] += count
+        stats["unique_users"] += count
+        stats["installs_by_source"][source] += count
+        stats["installs_by_player_type"][player_type] += count
 
     def write(self) -> Path:
         """Write metadata to file."""
         output_path = self.output_dir / "metadata.json"
+        if orjson is not None:
+            # Same text as the json.dump() below; config keys may be ints
+            data = orjson.dumps(
+                self.metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+            output_path.write_bytes(data)
+            return output_path
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(self.metadata, f, indent=2, ensure_ascii=False)
         return output_path
@@ -285,12 +407,14 @@ class OutputManager:
         compression: str = "gzip",
         batch_size: int = 10000,
         include_metadata: bool = True,
+        parquet_compression: str = "zstd",
     ):
         self.output_dir = output_dir
         self.output_format = output_format
         self.compression = compression
         self.batch_size = batch_size
         self.include_metadata = include_metadata
+        self.parquet_compression = parquet_compression
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -303,12 +427,13 @@ class OutputManager:
     def _setup_writers(self):
         """Initialize writers based on output format."""
         if self.output_format in ("jsonl", "both"):
-            ext = ".jsonl.gz" if self.compression == "gzip" else ".jsonl"
+            ext = JSONL_EXTENSIONS.get(self.compression, ".jsonl")
             jsonl_path = self.output_dir / f"events{ext}"
             self.jsonl_writer = JSONLWriter(
                 jsonl_path,
-                compress=(self.compression == "gzip"),
+                compress=(self.compression in JSONL_EXTENSIONS),
                 batch_size=self.batch_size,
+                codec=self.compression,
             )
 
         if self.output_format in ("parquet", "both"):
@@ -316,6 +441,7 @@ class OutputManager:
             self.parquet_writer = ParquetWriter(
                 parquet_path,
                 batch_size=self.batch_size * 10,  # Larger batches for Parquet
+                compression=self.parquet_compression,
             )
 
         if self.include_metadata:
@@ -347,8 +473,12 @@ class OutputManager:
 
     def write_events(self, events: list[Event]) -> None:
         """Write multiple events to all active writers."""
-        for event in events:
-            self.write_event(event)
+        if self.jsonl_writer:
+            self.jsonl_writer.write_events(events)
+        if self.parquet_writer:
+            self.parquet_writer.write_events(events)
+        if self.metadata_writer:
+            self.metadata_writer.count_events(events)
 
     def record_install(self, source: str, player_type: str) -> None:
         """Record an install in metadata."""
@@ -364,11 +494,13 @@ class OutputManager:
         return 0
 
     def close(self) -> None:
-        """Close all writers."""
-        if self.jsonl_writer:
-            self.jsonl_writer.close()
-        if self.parquet_writer:
-            self.parquet_writer.close()
+        """Close all writers; a failure in one does not skip the other."""
+        try:
+            if self.jsonl_writer:
+                self.jsonl_writer.close()
+        finally:
+            if self.parquet_writer:
+                self.parquet_writer.close()
 
     def finalize(self, end_date: str, generation_time: datetime) -> None:
         """Finalize output and write metadata."""
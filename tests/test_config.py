@@ -1,9 +1,12 @@
 """Tests for configuration loading and validation."""
 
+import tempfile
+
+import numpy as np
 import pytest
 from pathlib import Path
 
-from src.config import load_config, deep_merge, SimulationConfig
+from src.config import load_config, load_config_cached, deep_merge, SimulationConfig
 from src.validators import validate_config, ConfigValidator
 
 
@@ -39,6 +42,7 @@ class TestConfigLoading:
         result = deep_merge(base, override)
 
         assert result["level1"]["level2"] == {"a": 1, "b": 3, "c": 4}
+        assert base["level1"]["level2"] == {"a": 1, "b": 2}
 
     def test_load_default_config(self):
         """Test loading default config."""
@@ -49,6 +53,31 @@ class TestConfigLoading:
             assert "player_types" in config
             assert config["simulation"]["seed"] == 42
 
+    def test_load_config_cached(self):
+        """Test cached config load matches a fresh YAML load."""
+        config_path = Path("configs/default.yaml")
+        if config_path.exists():
+            expected = load_config(config_path)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                cache_dir = Path(tmpdir) / "cfg"
+                first = load_config_cached(config_path, cache_dir=cache_dir)
+                assert len(list(cache_dir.iterdir())) == 1
+                second = load_config_cached(config_path, cache_dir=cache_dir)
+            assert first == expected
+            assert second == expected
+
+    def test_config_cache_version_changes_key(self, monkeypatch):
+        """Test bumping the loader version bypasses older cache entries."""
+        import src.config as config_module
+        config_path = Path("configs/default.yaml")
+        if config_path.exists():
+            with tempfile.TemporaryDirectory() as tmpdir:
+                cache_dir = Path(tmpdir) / "cfg"
+                load_config_cached(config_path, cache_dir=cache_dir)
+                monkeypatch.setattr(config_module, "CONFIG_CACHE_VERSION", config_module.CONFIG_CACHE_VERSION + 1)
+                load_config_cached(config_path, cache_dir=cache_dir)
+                assert len(list(cache_dir.iterdir())) == 2
+
 
 class TestValidation:
     """Tests for config validation."""
@@ -120,6 +149,38 @@ class TestValidation:
         retention_errors = [e for e in errors if "retention must be" in e]
         assert len(retention_errors) > 0
 
+    def test_retention_range_rejects_nan(self):
+        """Test that a NaN retention value is reported as out of range."""
+        config = {
+            "simulation": {"seed": 42, "start_date": "2025-01-01", "duration_days": 7},
+            "installs": {"total": 100, "distribution": "uniform", "sources": {"organic": {"share": 1.0}}},
+            "player_types": {
+                "nan_type": {"share": 1.0, "retention": {"d1": 0.5, "d7": float("nan"), "d30": 0.1}},
+            },
+            "economy": {"initial": {"gold": 0, "gems": 0, "summon_tickets": 0, "energy": 0}},
+            "gacha": {"rates": {"common": 1.0}},
+            "shop": {},
+            "vip": {"levels": {}},
+            "progression": {},
+            "heroes": {},
+            "social": {},
+            "output": {},
+            "devices": {},
+        }
+
+        errors = ConfigValidator(config).validate()
+
+        assert any("retention.d7 must be between 0 and 1" in e for e in errors)
+
+    def test_missing_sections_stop_validation(self):
+        """Test that missing sections are reported without follow-on errors."""
+        config = {"simulation": {"seed": 42}, "installs": {"total": 10}}
+
+        errors = ConfigValidator(config).validate()
+
+        assert errors
+        assert all(e.startswith("Missing required section") for e in errors)
+
 
 class TestSimulationConfig:
     """Tests for SimulationConfig wrapper."""
@@ -138,3 +199,55 @@ class TestSimulationConfig:
         assert config.duration_days == 30
         assert config.total_installs == 1000
         assert config.output_format == "jsonl"
+        assert config.flat["simulation.seed"] == 123
+        assert "simulation" not in config.flat
+
+    def test_vip_level_for_spend(self):
+        """Test VIP level lookup for scalar and batched spend amounts."""
+        config = SimulationConfig({
+            "vip": {
+                "levels": {
+                    0: {"threshold": 0},
+                    1: {"threshold": 5},
+                    2: {"threshold": 15},
+                    3: {"threshold": 30},
+                }
+            }
+        })
+
+        assert config.get_vip_level_for_spend(0.0) == 0
+        assert config.get_vip_level_for_spend(4.99) == 0
+        assert config.get_vip_level_for_spend(5.0) == 1
+        assert config.get_vip_level_for_spend(29.99) == 2
+        assert config.get_vip_level_for_spend(1000.0) == 3
+
+        levels = config.get_vip_levels_for_spends([0.0, 4.99, 5.0, 29.99, 1000.0])
+        assert levels.tolist() == [0, 0, 1, 2, 3]
+
+    def test_weighted_selection(self):
+        """Test share-based picks agree between scalar and batched forms."""
+        config = SimulationConfig({
+            "installs": {
+                "sources": {
+                    "organic": {"share": 0.5},
+                    "paid": {"share": 0.3},
+                    "ads": {"share": 0.2},
+                }
+            },
+            "devices": {
+                "countries": {"US": 0.6, "DE": 0.3},
+                "app_versions": ["1.0", "1.1"],
+                "app_version_weights": [0.25, 0.75],
+            },
+        })
+
+        draws = [0.0, 0.49, 0.5, 0.79, 0.8, 0.99]
+        expected = ["organic", "organic", "paid", "paid", "ads", "ads"]
+        assert [config.select_install_source(v) for v in draws] == expected
+        assert config.select_install_sources(draws).tolist() == expected
+
+        assert config.select_country(0.95) == "other"
+        assert config.select_countries([0.1, 0.7, 0.95]).tolist() == ["US", "DE", "other"]
+
+        sampled = config.sample_app_versions(np.random.default_rng(0), 1000)
+        assert set(sampled.tolist()) <= {"1.0", "1.1"}
@@ -13,7 +13,8 @@ from src.simulation import Simulator
 from src.writers import OutputManager
 from src.world import WorldState
 from src.agents import AgentFactory, AgentBehavior
-from src.models import HeroRarity
+from src.events import EventEmitter
+from src.models import DeviceInfo, Event, HeroRarity, Platform, UserProperties
 
 
 class TestWorldState:
@@ -74,6 +75,60 @@ class TestAgentFactory:
         assert agent.gems == config.initial_gems
         assert agent.energy == config.initial_energy
 
+    def test_user_properties_cache(self):
+        """Test user properties are reused until an input changes."""
+        config_path = Path("configs/default.yaml")
+        if not config_path.exists():
+            pytest.skip("Default config not found")
+
+        config = SimulationConfig(load_config(config_path))
+        factory = AgentFactory(config, seed=42)
+
+        from datetime import date
+        agent = factory.create_agent(
+            install_date=date(2025, 1, 1),
+            install_source="organic",
+            rng=Random(42),
+        )
+        day = date(2025, 1, 3)
+
+        first = agent.get_user_properties(day)
+        assert agent.get_user_properties(day) is first
+        assert first.days_since_install == 2
+
+        agent.player_level += 1
+        leveled = agent.get_user_properties(day)
+        assert leveled is not first
+        assert leveled.player_level == first.player_level + 1
+
+        agent.total_spent_usd = 4.999
+        assert agent.get_user_properties(day).total_spent_usd == 5.0
+
+    def test_team_power_tracking(self):
+        """Test team_power stays in step with a full recalculation."""
+        config_path = Path("configs/default.yaml")
+        if not config_path.exists():
+            pytest.skip("Default config not found")
+
+        config = SimulationConfig(load_config(config_path))
+        factory = AgentFactory(config, seed=42)
+        world = WorldState.initialize(config, Random(42))
+
+        from datetime import date
+        agent = factory.create_agent(
+            install_date=date(2025, 1, 1),
+            install_source="organic",
+            rng=Random(42),
+        )
+        for template in list(world.hero_templates.values())[:7]:
+            agent.add_hero(template)
+        for hero in list(agent.heroes.values())[::2]:
+            agent.level_up_hero(hero)
+
+        tracked = agent.team_power
+        assert len(agent.team) == 5
+        assert agent.calculate_team_power() == tracked
+
 
 class TestSimulationDeterminism:
     """Tests for simulation reproducibility."""
@@ -125,6 +180,151 @@ class TestSimulationDeterminism:
         assert results[0] == results[1], "Simulation is not deterministic"
 
 
+class TestEventEmitter:
+    """Tests for event buffering and pooling."""
+
+    def test_events_held_across_flush_are_not_reused(self):
+        """Test returned events survive automatic and explicit flushes."""
+        config_path = Path("configs/default.yaml")
+        if not config_path.exists():
+            pytest.skip("Default config not found")
+
+        config = SimulationConfig(load_config(config_path))
+        factory = AgentFactory(config, seed=42)
+
+        from datetime import date, datetime
+        day = date(2025, 1, 1)
+        agent = factory.create_agent(install_date=day, install_source="organic", rng=Random(42))
+        timestamp = datetime(2025, 1, 1, 12, 0)
+
+        batches = []
+        emitter = EventEmitter(sink=lambda events: batches.append(list(events)), flush_threshold=2)
+        e1 = emitter.emit_economy_source(agent, timestamp, day, "gold", 10, 110, "quest")
+        e2 = emitter.emit_economy_source(agent, timestamp, day, "gold", 20, 130, "quest")
+        e3 = emitter.emit_economy_sink(agent, timestamp, day, "gold", 5, 125, "shop")
+
+        # The automatic flush hands e1/e2 over without recycling them
+        assert len(batches) == 1
+        assert e3 is not e1 and e3 is not e2
+        assert e2.event_name == "economy_source"
+        assert e2.event_properties["amount"] == 20
+
+        # An explicit flush recycles; events emitted afterwards reuse the pool
+        emitter.flush()
+        e4 = emitter.emit_economy_sink(agent, timestamp, day, "gold", 1, 124, "shop")
+        assert e4 is e3
+
+
+class TestWriters:
+    """Tests for output serialization."""
+
+    def test_event_json_matches_to_dict(self):
+        """Test the JSONL encoding carries exactly the to_dict() content."""
+        from datetime import datetime
+        event = Event(
+            "evt_1",
+            "error",
+            datetime(2025, 1, 1, 12, 30),
+            "u_000001",
+            "s_1",
+            DeviceInfo("d_000001", Platform.IOS, "17.1", "1.0.0", "iPhone 15", "DE", "de"),
+            UserProperties(3, 0, 0.0, 2, "2024-12-30", 1),
+            {"onboarding_length": "short"},
+            {"error_type": "network", "error_message": "Zeitüberschreitung"},
+        )
+
+        assert json.loads(event.to_json()) == event.to_dict()
+        assert event.to_json_bytes() == event.to_json().encode("utf-8")
+
+    def test_stdlib_json_fallback_matches_orjson(self, monkeypatch):
+        """Test JSONL lines are byte-identical with and without orjson."""
+        import src.models as models
+        if models.orjson is None:
+            pytest.skip("orjson not installed")
+
+        from datetime import datetime
+        event = Event(
+            "evt_1",
+            "economy_source",
+            datetime(2025, 1, 1, 12, 30, 5, 250000),
+            "u_000001",
+            "s_1",
+            DeviceInfo("d_000001", Platform.ANDROID, "14", "1.0.0", "Pixel 8", "RU", "ru"),
+            UserProperties(3, 1, 4.99, 2, "2024-12-30", 1),
+            {"onboarding_length": "short"},
+            {"currency": "gems", "amount": 50, "ratio": 0.125, "note": "Награда", "tags": [], "extra": None},
+        )
+
+        expected = event.to_json_bytes()
+        monkeypatch.setattr(models, "orjson", None)
+        assert event.to_json_bytes() == expected
+
+    @pytest.mark.parametrize("codec, filename", [
+        ("zstd", "events.jsonl.zst"),
+        ("lz4", "events.jsonl.lz4"),
+    ])
+    def test_compressed_jsonl_round_trip(self, codec, filename):
+        """Test zstd/lz4-compressed JSONL output decodes to the written events."""
+        import pyarrow as pa
+        from datetime import datetime
+        event = Event(
+            "evt_1",
+            "error",
+            datetime(2025, 1, 1, 12, 30),
+            "u_000001",
+            "s_1",
+            DeviceInfo("d_000001", Platform.IOS, "17.1", "1.0.0", "iPhone 15", "DE", "de"),
+            UserProperties(3, 0, 0.0, 2, "2024-12-30", 1),
+            {},
+            {"error_type": "network"},
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            with OutputManager(output_dir, compression=codec, include_metadata=False) as output:
+                output.write_events([event, event])
+
+            path = output_dir / filename
+            with pa.CompressedInputStream(pa.OSFile(str(path)), codec) as f:
+                lines = f.read().decode("utf-8").splitlines()
+
+        assert [json.loads(line) for line in lines] == [event.to_dict()] * 2
+
+
+    def test_close_after_failed_write_still_closes_files(self):
+        """Test a failed background write still closes every output file."""
+        import pyarrow.parquet as pq
+        from datetime import datetime
+        event = Event(
+            "evt_1",
+            "error",
+            datetime(2025, 1, 1, 12, 30),
+            "u_000001",
+            "s_1",
+            DeviceInfo("d_000001", Platform.IOS, "17.1", "1.0.0", "iPhone 15", "DE", "de"),
+            UserProperties(3, 0, 0.0, 2, "2024-12-30", 1),
+            {},
+            {"error_type": "network"},
+        )
+
+        def fail(payload):
+            raise OSError("disk full")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_dir = Path(tmpdir)
+            output = OutputManager(output_dir, output_format="both", batch_size=1, include_metadata=False)
+            with pytest.raises(OSError, match="disk full"):
+                with output:
+                    output.jsonl_writer._sink._write = fail
+                    output.write_events([event])
+
+            assert output.jsonl_writer._file is None
+            assert output.parquet_writer._writer is None
+            with gzip.open(output_dir / "events.jsonl.gz", "rb") as f:
+                assert f.read() == b""
+            assert pq.read_table(output_dir / "events.parquet").num_rows == 1
+
+
 class TestAgentBehavior:
     """Tests for agent behavior model."""
 